@@ -1,14 +1,41 @@
 from __future__ import annotations
 
-from cryptography.fernet import Fernet, InvalidToken
+from functools import lru_cache
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
 
+def _get_keys() -> list[str]:
+    """Configured keys, newest first: MFA_FERNET_KEYS, then the legacy single MFA_FERNET_KEY."""
+    keys = [key for key in getattr(settings, "MFA_FERNET_KEYS", None) or [] if key]
+    legacy = getattr(settings, "MFA_FERNET_KEY", None)
+    if legacy and legacy not in keys:
+        keys.append(legacy)
+    return keys
 
-def _get_fernet() -> Fernet:
-    key = getattr(settings, "MFA_FERNET_KEY", None)
-    if not key:
+
+@lru_cache(maxsize=1)
+def _get_fernets() -> tuple[Fernet, ...]:
+    keys = _get_keys()
+    if not keys:
         raise RuntimeError("MFA_FERNET_KEY is not configured")
-    return Fernet(key)
+    return tuple(Fernet(key) for key in keys)
+
+
+@lru_cache(maxsize=1)
+def _get_fernet() -> MultiFernet:
+    # Encrypts with the first key, decrypts with any of them
+    return MultiFernet(list(_get_fernets()))
+
+
+@receiver(setting_changed)
+def _reset_fernet(setting, **kwargs):
+    if setting in ("MFA_FERNET_KEY", "MFA_FERNET_KEYS"):
+        _get_fernets.cache_clear()
+        _get_fernet.cache_clear()
 
 
 def encrypt_text(value: str) -> str:
@@ -22,3 +49,21 @@ def decrypt_text(value: str) -> str:
         return f.decrypt(value.encode()).decode()
     except InvalidToken as err:  # re-raise as ValueError to keep deps local
         raise ValueError("Invalid MFA secret token") from err
+
+
+def rotate_text(value: str) -> str:
+    """Re-encrypt a token under the current primary key."""
+    f = _get_fernet()
+    try:
+        return f.rotate(value.encode()).decode()
+    except InvalidToken as err:
+        raise ValueError("Invalid MFA secret token") from err
+
+
+def needs_rotation(value: str) -> bool:
+    """True if ``value`` is not encrypted under the current primary key."""
+    try:
+        _get_fernets()[0].decrypt(value.encode())
+    except InvalidToken:
+        return True
+    return False
@@ -0,0 +1,74 @@
+from functools import reduce
+from operator import or_
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+
+from apps.authentication.crypto import needs_rotation, rotate_text
+
+User = get_user_model()
+
+# Rows per UPDATE: its WHERE is an OR of one term per row, and SQLite caps expression depth at 1000
+UPDATE_BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-encrypt User.mfa_secret under the primary key of MFA_FERNET_KEYS. "
+        "Runs in small keyset-paginated chunks, each committed on its own, so it can be interrupted and re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size must be positive")
+
+        qs = User.objects.exclude(Q(mfa_secret__isnull=True) | Q(mfa_secret="")).order_by("pk")
+        last_pk = None
+        scanned = rotated = failed = 0
+
+        while True:
+            chunk_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            chunk = list(chunk_qs.values_list("pk", "mfa_secret")[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1][0]
+            scanned += len(chunk)
+
+            updates = []
+            for pk, secret in chunk:
+                if not needs_rotation(secret):
+                    continue
+                try:
+                    updates.append((pk, secret, rotate_text(secret)))
+                except ValueError:
+                    failed += 1
+                    self.stderr.write(f"User {pk}: secret cannot be decrypted with any configured key")
+
+            if updates and not options["dry_run"]:
+                with transaction.atomic():
+                    for start in range(0, len(updates), UPDATE_BATCH_SIZE):
+                        rotated += self._rotate(updates[start : start + UPDATE_BATCH_SIZE])
+            elif updates:
+                rotated += len(updates)
+
+            self.stdout.write(f"Scanned {scanned}, rotated {rotated}, failed {failed}")
+
+        prefix = "[dry run] " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(f"{prefix}Done: scanned {scanned}, rotated {rotated}, failed {failed}"))
+
+    def _rotate(self, updates):
+        """One UPDATE; a row is only rewritten if its secret is unchanged since it was read."""
+        unchanged = reduce(or_, (Q(pk=pk, mfa_secret=old) for pk, old, _ in updates))
+        return User.objects.filter(unchanged).update(
+            mfa_secret=Case(
+                *(When(pk=pk, mfa_secret=old, then=Value(new)) for pk, old, new in updates),
+                default=F("mfa_secret"),
+            )
+        )
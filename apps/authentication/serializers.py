@@ -77,7 +77,11 @@ class MFADisableSerializer(serializers.Serializer):
 
 
 class MFASetupStartSerializer(serializers.Serializer):
-    pass
+    qr_format = serializers.ChoiceField(
+        choices=["png", "svg", "uri"],
+        default="png",
+        help_text="png: base64 image, svg: SVG markup, uri: no image (render otpauth_uri on the client)",
+    )
 
 
 class MFASetupConfirmSerializer(serializers.Serializer):
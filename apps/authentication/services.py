@@ -1,18 +1,20 @@
 import base64
+import contextlib
+import heapq
 import json
 import secrets
+import threading
 from io import BytesIO
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
 
-import msal
-import pyotp
-import qrcode
+import redis
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.hashers import check_password, make_password
-from django.core.mail import send_mail
-from django.db import transaction
+from django.contrib.auth.hashers import check_password
+from django.core import signing
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
 from rest_framework import exceptions
 
 from apps.authentication.crypto import decrypt_text, encrypt_text
@@ -22,7 +24,8 @@ from apps.authentication.utils import (
     generate_tokens_for_user,
     generate_verification_token,
 )
-from apps.common.redis_client import redis_client
+from apps.common.mail_queue import enqueue_mail
+from apps.common.redis_client import get_redis_client, redis_client
 from apps.users.models import OAuthProvider
 
 if TYPE_CHECKING:
@@ -32,6 +35,11 @@ else:
 
 User = get_user_model()
 
+BACKUP_CODE_KEY_SALT = "apps.authentication.mfa_backup_code"
+
+MFA_SETUP_TTL = 900  # 15 minutes
+MFA_QR_FORMATS = ("png", "svg")
+
 
 def send_verification_email(user: "UserType"):
     """Generate token and send verification email."""
@@ -40,10 +48,9 @@ def send_verification_email(user: "UserType"):
     frontend_url = getattr(settings, "FRONTEND_URL", "http://localhost:3000")
     verification_link = f"{frontend_url}/verify-email?token={token}"
 
-    send_mail(
+    enqueue_mail(
         "Verify your email",
         f"Please click the following link to verify your email: {verification_link}",
-        settings.DEFAULT_FROM_EMAIL,
         [user.email],
     )
 
@@ -55,10 +62,9 @@ def send_password_reset_email(user: "UserType"):
     frontend_url = getattr(settings, "FRONTEND_URL", "http://localhost:3000")
     reset_link = f"{frontend_url}/reset-password?token={token}"
 
-    send_mail(
+    enqueue_mail(
         "Reset your password",
         f"Please click the following link to reset your password: {reset_link}",
-        settings.DEFAULT_FROM_EMAIL,
         [user.email],
     )
 
@@ -69,6 +75,11 @@ def _to_str(val):
     return val
 
 
+def _hash_backup_code(user, code: str) -> str:
+    """Keyed SHA-256 of a backup code (SECRET_KEY-derived key, user id as per-user salt)."""
+    return salted_hmac(BACKUP_CODE_KEY_SALT, f"{user.id}:{code.upper()}", algorithm="sha256").hexdigest()
+
+
 def _generate_backup_codes(user):
     """Generate backup codes, store hashed in DB, return plaintext list."""
     backup_codes = [secrets.token_hex(4).upper() for _ in range(8)]
@@ -76,11 +87,28 @@ def _generate_backup_codes(user):
     user.mfa_backup_codes.all().delete()
     # Store hashed
     MFABackupCode.objects.bulk_create(
-        [MFABackupCode(user=user, code_hash=make_password(code)) for code in backup_codes]
+        [MFABackupCode(user=user, code_hash=_hash_backup_code(user, code)) for code in backup_codes]
     )
     return backup_codes
 
 
+def _consume_backup_code(user, code: str) -> bool:
+    """Mark a matching unused backup code as used. Returns True if one was consumed."""
+    code_hash = _hash_backup_code(user, code)
+    unused = user.mfa_backup_codes.filter(used_at__isnull=True)
+
+    match = unused.filter(code_hash=code_hash).values_list("pk", "code_hash").first()
+    if match and constant_time_compare(match[1], code_hash):
+        # Conditional update so concurrent attempts cannot consume the same code twice
+        return bool(unused.filter(pk=match[0]).update(used_at=timezone.now()))
+
+    # Codes issued before keyed hashing are PBKDF2 hashes ("algorithm$..."); they stay valid until regenerated
+    for pk, legacy_hash in unused.filter(code_hash__contains="$").values_list("pk", "code_hash"):
+        if check_password(code.upper(), legacy_hash):
+            return bool(unused.filter(pk=pk).update(used_at=timezone.now()))
+    return False
+
+
 def handle_mfa_flow(user):
     """
     If MFA is enabled, return MFA ticket and response payload.
@@ -99,26 +127,63 @@ def handle_mfa_flow(user):
     }
 
 
-def setup_mfa_start(user) -> dict:
-    """Start MFA setup: generate secret, store encrypted pending secret, return QR + manual key."""
-    secret = pyotp.random_base32()
-    # store encrypted pending secret in Redis with TTL (15 minutes)
-    enc_secret = encrypt_text(secret)
-    redis_client.setex(f"mfa:setup:{user.id}", 900, enc_secret)
+def _render_qr(data: str, qr_format: str) -> str:
+    """Render ``data`` as a base64 PNG or an SVG document."""
+    import qrcode
+    import qrcode.image.svg
 
-    totp_uri = pyotp.totp.TOTP(secret).provisioning_uri(name=user.email, issuer_name="UTM Canteen")
+    if qr_format == "svg":
+        return qrcode.make(data, image_factory=qrcode.image.svg.SvgPathImage, border=4).to_string(encoding="unicode")
 
     qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(totp_uri)
+    qr.add_data(data)
     qr.make(fit=True)
     qr_img = qr.make_image(fill_color="black", back_color="white")
     buffer = BytesIO()
     qr_img.save(buffer, format="PNG")
-    qr_code_b64 = base64.b64encode(buffer.getvalue()).decode()
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def _clear_mfa_setup(user):
+    setup_key = f"mfa:setup:{user.id}"
+    redis_client.delete(setup_key, *(f"{setup_key}:qr:{fmt}" for fmt in MFA_QR_FORMATS))
+
+
+def setup_mfa_start(user, qr_format: str = "png") -> dict:
+    """Start MFA setup: generate secret, store encrypted pending secret, return QR + manual key.
+
+    A pending secret is reused until it expires, together with the QR rendered for it,
+    so restarting setup does no image work. ``qr_format="uri"`` skips rendering entirely
+    and leaves QR drawing to the client (from ``otpauth_uri``).
+    """
+    import pyotp
+
+    setup_key = f"mfa:setup:{user.id}"
+    qr_key = f"{setup_key}:qr:{qr_format}"
+
+    enc_secret, qr_code = (_to_str(value) for value in redis_client.mget(setup_key, qr_key))
+    if enc_secret:
+        secret = decrypt_text(enc_secret)
+        ttl = redis_client.ttl(setup_key)
+    else:
+        secret = pyotp.random_base32()
+        # store encrypted pending secret in Redis with TTL (15 minutes)
+        redis_client.setex(setup_key, MFA_SETUP_TTL, encrypt_text(secret))
+        ttl = MFA_SETUP_TTL
+        qr_code = None
+
+    totp_uri = pyotp.totp.TOTP(secret).provisioning_uri(name=user.email, issuer_name="UTM Canteen")
+
+    if qr_format in MFA_QR_FORMATS and not qr_code:
+        qr_code = _render_qr(totp_uri, qr_format)
+        # Expire together with the pending secret it encodes
+        redis_client.setex(qr_key, max(ttl, 1), qr_code)
 
     return {
         "message": "MFA setup started",
-        "qr_code": qr_code_b64,
+        "qr_code": qr_code,
+        "qr_format": qr_format,
+        "otpauth_uri": totp_uri,
         "manual_key": secret,
         "issuer": "UTM Canteen",
         "account": user.email,
@@ -127,6 +192,8 @@ def setup_mfa_start(user) -> dict:
 
 def setup_mfa_confirm(user, code: str) -> dict:
     """Confirm MFA setup using the pending secret."""
+    import pyotp
+
     enc_secret = _to_str(redis_client.get(f"mfa:setup:{user.id}"))
     if not enc_secret:
         raise exceptions.ValidationError({"error": "No pending MFA setup or it has expired"})
@@ -142,8 +209,8 @@ def setup_mfa_confirm(user, code: str) -> dict:
     user.mfa_type = "totp"
     user.save(update_fields=["mfa_secret", "mfa_enabled", "mfa_type"])
 
-    # Clear pending secret
-    redis_client.delete(f"mfa:setup:{user.id}")
+    # Clear pending secret and its cached QR codes
+    _clear_mfa_setup(user)
 
     # Generate and return backup codes
     return {
@@ -173,7 +240,20 @@ def create_mfa_ticket(user, context: dict | None = None, ttl_seconds: int = 300)
     return ticket
 
 
+def get_mfa_ticket_user_id(ticket: str) -> str | None:
+    """The user a pending MFA ticket belongs to, or None if it is unknown, expired or corrupt."""
+    raw = redis_client.get(f"mfa:pending:{ticket}")
+    if not raw:
+        return None
+    try:
+        return json.loads(_to_str(raw))["user_id"]
+    except (ValueError, KeyError):
+        return None
+
+
 def verify_mfa(ticket: str, code: str) -> dict:
+    import pyotp
+
     # Retrieve pending ticket
     raw = redis_client.get(f"mfa:pending:{ticket}")
     if not raw:
@@ -197,33 +277,24 @@ def verify_mfa(ticket: str, code: str) -> dict:
 
     # Rate limit attempts per ticket
     attempts_key = f"mfa:attempts:{ticket}"
-    attempts = redis_client.incr(attempts_key)
-    if attempts == 1:
-        # align attempts TTL with ticket TTL (best effort: 5 min)
-        redis_client.expire(attempts_key, 300)
+    # incr + expire in one MULTI so a crash in between can't leave a counter without TTL
+    with redis_client.pipeline() as pipe:
+        attempts, _ = pipe.incr(attempts_key).expire(attempts_key, 300, nx=True).execute()
     if attempts > 5:
         redis_client.delete(f"mfa:pending:{ticket}")
         raise exceptions.ValidationError({"error": "Too many failed attempts"})
 
-    # Backup codes (consume atomically)
+    # TOTP first (cheap, and the common case), then backup codes
     matched = False
-    with transaction.atomic():
-        qs = user.mfa_backup_codes.select_for_update().filter(used_at__isnull=True)
-        for bc in qs:
-            if check_password(code.upper(), bc.code_hash):
-                bc.used_at = timezone.now()
-                bc.save(update_fields=["used_at"])
-                matched = True
-                break
-
-    if not matched:
-        # TOTP path
-        if user.mfa_type == "totp":
-            secret = decrypt_text(user.mfa_secret)
-            totp = pyotp.TOTP(secret)
-            if not totp.verify(code, valid_window=1):
+    if user.mfa_type == "totp":
+        secret = decrypt_text(user.mfa_secret)
+        if not pyotp.TOTP(secret).verify(code, valid_window=1):
+            matched = _consume_backup_code(user, code)
+            if not matched:
                 raise exceptions.ValidationError({"error": "Invalid MFA code"})
-        else:
+    else:
+        matched = _consume_backup_code(user, code)
+        if not matched:
             raise exceptions.ValidationError({"error": "Unsupported MFA type"})
 
     # Success -> clean up ticket & attempts
@@ -256,13 +327,95 @@ def disable_mfa(user, password: str) -> dict:
 # ============================================================================
 
 
+MSAL_HTTP_CACHE_KEY = "msal:http_cache"
+MSAL_HTTP_CACHE_TTL = 86400  # MSAL keeps discovery responses for 24 hours
+
+# Discovery documents are disposable, so they live with the other cache entries
+cache_client = get_redis_client("cache")
+
+_msal_app = None
+_msal_app_lock = threading.Lock()
+
+
+MSAL_HTTP_CACHE_SALT = "msal.http_cache"
+
+
+def _load_msal_http_cache() -> dict:
+    """
+    MSAL http_cache snapshot (authority/OpenID discovery responses, no tokens) shared via Redis.
+    Stored as signed JSON: nothing from Redis is unpickled, and a tampered snapshot (e.g. a
+    forged token endpoint) is discarded.
+    """
+    # Private MSAL internals: pyproject.toml pins msal to the releases known to have them
+    from msal.individual_cache import _ExpiringMapping
+    from msal.throttled_http_client import NormalizedResponse
+
+    try:
+        raw = cache_client.get(MSAL_HTTP_CACHE_KEY)
+        if not raw:
+            return {}
+        data = signing.loads(raw, salt=MSAL_HTTP_CACHE_SALT, max_age=MSAL_HTTP_CACHE_TTL)
+        http_cache = {
+            key: NormalizedResponse(SimpleNamespace(**response)) for key, response in data["responses"].items()
+        }
+        http_cache[_ExpiringMapping._INDEX] = ([list(entry) for entry in data["sequence"]], data["timestamps"])
+        return http_cache
+    except (redis.RedisError, signing.BadSignature, KeyError, TypeError, ValueError):
+        # MSAL's own recipe: a cache it cannot read is simply discarded
+        return {}
+
+
+def _save_msal_http_cache(http_cache: dict):
+    from msal.individual_cache import _ExpiringMapping
+    from msal.throttled_http_client import NormalizedResponse
+
+    # Only what MSAL's ExpiringMapping holds: normalized responses and its expiry index
+    responses = {
+        key: {"status_code": value.status_code, "text": value.text, "headers": dict(value.headers)}
+        for key, value in http_cache.items()
+        if isinstance(value, NormalizedResponse)
+    }
+    sequence, timestamps = http_cache.get(_ExpiringMapping._INDEX, ([], {}))
+    sequence = [entry for entry in sequence if entry[2] in responses]
+    heapq.heapify(sequence)
+    data = {
+        "responses": responses,
+        "sequence": sequence,
+        "timestamps": {key: value for key, value in timestamps.items() if key in responses},
+    }
+    # Best effort: without it the next worker just repeats discovery once
+    with contextlib.suppress(redis.RedisError, TypeError, ValueError):
+        snapshot = signing.dumps(data, salt=MSAL_HTTP_CACHE_SALT, compress=True)
+        cache_client.setex(MSAL_HTTP_CACHE_KEY, MSAL_HTTP_CACHE_TTL, snapshot)
+
+
 def get_msal_app():
-    """Get MSAL confidential client application."""
-    return msal.ConfidentialClientApplication(
-        client_id=settings.MICROSOFT_CLIENT_ID,
-        client_credential=settings.MICROSOFT_CLIENT_SECRET,
-        authority=f"https://login.microsoftonline.com/{settings.MICROSOFT_TENANT_ID}",
-    )
+    """Get the process-wide MSAL confidential client application.
+
+    Authority discovery happens when the client is constructed, so the client is built
+    once per process, seeded with discovery responses cached in Redis by other workers.
+    Tokens are not cached: sign-in only uses the authorization code exchange.
+    """
+    global _msal_app
+    if _msal_app is None:
+        with _msal_app_lock:
+            if _msal_app is None:
+                # Imported on first use: msal (and requests) is heavy and only needed for Microsoft sign-in
+                import msal
+
+                http_cache = _load_msal_http_cache()
+                was_cached = bool(http_cache)
+                _msal_app = msal.ConfidentialClientApplication(
+                    client_id=settings.MICROSOFT_CLIENT_ID,
+                    client_credential=settings.MICROSOFT_CLIENT_SECRET,
+                    authority=settings.MICROSOFT_AUTHORITY,
+                    instance_discovery=settings.MICROSOFT_INSTANCE_DISCOVERY,
+                    timeout=settings.MICROSOFT_HTTP_TIMEOUT,
+                    http_cache=http_cache,
+                )
+                if not was_cached:
+                    _save_msal_http_cache(http_cache)
+    return _msal_app
 
 
 def get_microsoft_auth_url() -> dict:
@@ -104,12 +104,16 @@ class SessionService:
         user_key = SessionService._get_user_sessions_key(user_id)
         jtis = redis_client.smembers(user_key)
 
+        if not jtis:
+            return []
+
         sessions = []
         invalid_jtis = []
 
-        for jti in jtis:
-            key = SessionService._get_session_key(jti)
-            data_json = redis_client.get(key)
+        # One round trip for all sessions instead of a GET per session
+        jtis = list(jtis)
+        values = redis_client.mget([SessionService._get_session_key(jti) for jti in jtis])
+        for jti, data_json in zip(jtis, values, strict=True):
             if data_json:
                 session = json.loads(data_json)
                 session["jti"] = jti
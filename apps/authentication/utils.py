@@ -1,10 +1,9 @@
 import random
 
-from django.conf import settings
-from django.core.mail import send_mail
 from django.core.signing import BadSignature, SignatureExpired, TimestampSigner
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.common.mail_queue import enqueue_mail
 from apps.common.redis_client import redis_client
 
 OTP_TTL = 300  # 5 minutes
@@ -32,10 +31,9 @@ def generate_email_otp(user):
     key = f"otp:{user.id}"
     redis_client.setex(key, OTP_TTL, otp)
 
-    send_mail(
+    enqueue_mail(
         "Your OTP Code",
         f"Your verification code is {otp}. It expires in {OTP_TTL // 60} minutes.",
-        settings.DEFAULT_FROM_EMAIL,
         [user.email],
     )
     return otp
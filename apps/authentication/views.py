@@ -1,3 +1,5 @@
+from collections.abc import Mapping
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.middleware.csrf import get_token
@@ -29,6 +31,7 @@ from apps.authentication.serializers import (
 )
 from apps.authentication.services import (
     disable_mfa,
+    get_mfa_ticket_user_id,
     get_microsoft_auth_url,
     handle_mfa_flow,
     handle_microsoft_callback,
@@ -41,6 +44,7 @@ from apps.authentication.services import (
 )
 from apps.authentication.session_service import SessionService
 from apps.authentication.utils import verify_email_token, verify_password_reset_token
+from apps.common.throttling import AccountRateThrottle, IPRateThrottle
 
 User = get_user_model()
 
@@ -91,6 +95,8 @@ class CsrfView(APIView):
 
 
 class RegisterView(CreateAPIView):
+    throttle_classes = [IPRateThrottle]
+    throttle_scope = "register"
     permission_classes = [AllowAny]
     authentication_classes = []
 
@@ -117,6 +123,8 @@ class RegisterView(CreateAPIView):
 
 
 class LoginView(TokenObtainPairView):
+    throttle_classes = [IPRateThrottle, AccountRateThrottle]
+    throttle_scope = "login"
     serializer_class = CustomTokenObtainPairSerializer
 
     def post(self, request, *args, **kwargs):
@@ -168,6 +176,8 @@ class EmailVerifyView(APIView):
 
 
 class EmailResendView(APIView):
+    throttle_classes = [IPRateThrottle, AccountRateThrottle]
+    throttle_scope = "email_resend"
     permission_classes = [AllowAny]
     serializer_class = EmailResendSerializer
 
@@ -194,7 +204,7 @@ class MFASetupStartView(APIView):
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
-        data = setup_mfa_start(request.user)
+        data = setup_mfa_start(request.user, serializer.validated_data["qr_format"])
         return Response(data)
 
 
@@ -219,9 +229,19 @@ class MFABackupCodesRegenerateView(APIView):
 
 
 class MFAVerifyView(APIView):
+    throttle_classes = [IPRateThrottle, AccountRateThrottle]
+    throttle_scope = "mfa_verify"
     permission_classes = [AllowAny]
     serializer_class = MFAVerifySerializer
 
+    def get_throttle_account(self, request):
+        # Per user, not per ticket: logging in again must not start a fresh budget of guesses
+        if not isinstance(request.data, Mapping):
+            # Runs before the serializer, which rejects such a body
+            return None
+        ticket = request.data.get("ticket")
+        return get_mfa_ticket_user_id(ticket) if ticket and isinstance(ticket, str) else None
+
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -397,6 +417,8 @@ class SessionRevokeAllView(APIView):
 
 
 class PasswordResetRequestView(APIView):
+    throttle_classes = [IPRateThrottle, AccountRateThrottle]
+    throttle_scope = "password_reset"
     permission_classes = [AllowAny]
     serializer_class = PasswordResetRequestSerializer
 
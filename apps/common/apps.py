@@ -6,11 +6,29 @@ class CommonConfig(AppConfig):
     name = "apps.common"
 
     def ready(self):
-        from django.db.models.signals import post_migrate
-        from django.dispatch import receiver
+        from django.contrib.auth import get_user_model
+        from django.contrib.auth.models import Group
+        from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete
 
         from .permissions import create_default_groups
+        from .rbac import (
+            clear_role_group_ids,
+            invalidate_group_grants,
+            invalidate_group_permission_grants,
+            invalidate_membership_grants,
+        )
 
-        @receiver(post_migrate)
-        def create_groups(sender, **kwargs):
-            create_default_groups(sender, **kwargs)
+        user_model = get_user_model()
+
+        post_migrate.connect(create_default_groups, dispatch_uid="common.create_default_groups")
+        post_save.connect(clear_role_group_ids, sender=Group, dispatch_uid="common.clear_role_group_ids.save")
+        post_delete.connect(clear_role_group_ids, sender=Group, dispatch_uid="common.clear_role_group_ids.delete")
+        for through in (user_model.groups.through, user_model.user_permissions.through):
+            m2m_changed.connect(
+                invalidate_membership_grants, sender=through, dispatch_uid=f"common.grants.{through._meta.label}"
+            )
+        m2m_changed.connect(
+            invalidate_group_permission_grants, sender=Group.permissions.through, dispatch_uid="common.grants.group"
+        )
+        post_save.connect(invalidate_group_grants, sender=Group, dispatch_uid="common.grants.group_save")
+        pre_delete.connect(invalidate_group_grants, sender=Group, dispatch_uid="common.grants.group_delete")
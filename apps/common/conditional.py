@@ -0,0 +1,168 @@
+"""
+Conditional GET (ETag / If-None-Match) backed by Redis version keys.
+
+A scope ("catalogue", "wallet:<user id>", ...) has a random version token in Redis.
+Writes delete the token after commit (``bump_etag_scopes``), so the next read mints a
+new one. A view's ETag hashes the tokens of the scopes it depends on with the request
+path, so an unchanged poll is answered with 304 after one MGET, before any queryset
+or serializer runs. Scopes whose data changes with the clock (e.g. menus dropping off
+once they start) get a token that expires at that moment.
+
+Views whose response is the same for every caller (``cache_payload``) also keep the
+rendered body in Redis, gzipped, under its ETag: a repeat request is answered from
+Redis without queries, serialization or compression, and the next version of the
+scopes simply misses.
+"""
+
+import gzip
+import hashlib
+import logging
+import secrets
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+from django.middleware.gzip import re_accepts_gzip
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.utils.text import compress_string
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.common.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+redis_client = get_redis_client("cache")
+payload_client = get_redis_client("cache", binary=True)
+
+KEY_PREFIX = "etag:"
+PAYLOAD_PREFIX = "payload:"
+
+# Clients may keep the body but must revalidate; shared caches must not store per-user responses
+CACHE_CONTROL = "private, no-cache"
+
+
+def bump_etag_scopes(*scopes):
+    """Invalidate the ETags of these scopes once the current transaction commits."""
+
+    def bump():
+        try:
+            redis_client.delete(*(KEY_PREFIX + scope for scope in scopes))
+        except redis.RedisError as e:
+            logger.warning(f"Could not bump ETag scopes {scopes}: {e}")
+
+    # After commit: a reader in between would otherwise tag the old rows with a fresh token
+    transaction.on_commit(bump)
+
+
+def get_scope_versions(scopes):
+    """Version tokens for ``{scope: expires_at callable or None}``, minting missing ones. None if Redis fails."""
+    keys = [KEY_PREFIX + scope for scope in scopes]
+    try:
+        versions = redis_client.mget(keys)
+        for index, expires_at in enumerate(scopes.values()):
+            if versions[index] is not None:
+                continue
+            token = secrets.token_hex(8)
+            deadline = expires_at() if expires_at else None
+            if deadline is not None and deadline <= timezone.now():
+                return None
+            if redis_client.set(keys[index], token, nx=True, exat=deadline):
+                versions[index] = token
+            else:
+                # Another request minted it first
+                versions[index] = redis_client.get(keys[index])
+    except redis.RedisError as e:
+        logger.warning(f"ETag versions unavailable: {e}")
+        return None
+    return versions
+
+
+def accepts_gzip(request):
+    """Same test as Django's GZipMiddleware."""
+    return re_accepts_gzip.search(request.META.get("HTTP_ACCEPT_ENCODING", "")) is not None
+
+
+def get_cached_payload(etag):
+    try:
+        return payload_client.get(PAYLOAD_PREFIX + etag)
+    except redis.RedisError as e:
+        logger.warning(f"Cached payload unavailable: {e}")
+        return None
+
+
+def store_payload(etag, payload):
+    try:
+        payload_client.set(PAYLOAD_PREFIX + etag, payload, ex=settings.PAYLOAD_CACHE_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"Could not cache payload: {e}")
+
+
+class ConditionalGetMixin:
+    """
+    Adds a strong ETag to GET responses and answers matching If-None-Match with 304.
+    Views implement ``get_etag_scopes()``, returning ``{scope: expires_at}`` or None to skip.
+    Runs inside ``get()``, i.e. after authentication and permission checks.
+    With ``cache_payload``, 200 responses are served from a gzipped copy in Redis;
+    only for views whose response does not depend on the caller.
+    """
+
+    cache_payload = False
+
+    def get_etag_scopes(self):
+        raise NotImplementedError
+
+    def get_etag(self, request):
+        scopes = self.get_etag_scopes()
+        if not scopes:
+            return None
+        versions = get_scope_versions(scopes)
+        if versions is None or None in versions:
+            return None
+        # Today's local date, as WeeklyMenuPagination uses: week-based pages roll over at local midnight
+        parts = [type(self).__qualname__, request.get_full_path(), request.accepted_media_type]
+        parts.append(str(timezone.localdate()))
+        digest = hashlib.sha256("\n".join(parts + versions).encode()).hexdigest()[:32]
+        return f'"{digest}"'
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        # Weak comparison: GZipMiddleware marks the ETags of responses it compresses weak
+        if etag and etag in {tag.removeprefix("W/") for tag in parse_etags(request.headers.get("If-None-Match", ""))}:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+        if etag and self.cache_payload:
+            payload = get_cached_payload(etag)
+            if payload is not None:
+                return self.payload_response(request, payload, etag)
+
+        response = super().get(request, *args, **kwargs)
+        if etag and self.cache_payload and response.status_code == status.HTTP_200_OK:
+            # Rendered here rather than after finalize_response, to compress and store it once
+            content = request.accepted_renderer.render(
+                response.data, request.accepted_media_type, self.get_renderer_context()
+            )
+            # No secrets in a shared payload: no random padding against BREACH, unlike the middleware
+            payload = compress_string(content)
+            store_payload(etag, payload)
+            return self.payload_response(request, payload, etag, content)
+        if etag and response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+            response["Cache-Control"] = CACHE_CONTROL
+        return response
+
+    def payload_response(self, request, payload, etag, content=None):
+        """The gzipped payload as is when the client takes gzip, else decompressed."""
+        renderer = request.accepted_renderer
+        content_type = f"{renderer.media_type}; charset={renderer.charset}" if renderer.charset else renderer.media_type
+        if accepts_gzip(request):
+            response = HttpResponse(payload, content_type=content_type, headers={"Content-Encoding": "gzip"})
+        else:
+            response = HttpResponse(content or gzip.decompress(payload), content_type=content_type)
+        patch_vary_headers(response, ("Accept-Encoding",))
+        response["ETag"] = etag
+        response["Cache-Control"] = CACHE_CONTROL
+        return response
@@ -1,5 +1,6 @@
 from rest_framework import permissions
 
+from .rbac import has_role_permission
 from .utils import is_admin_or_staff, is_authenticated, is_customer, is_verified_customer
 
 
@@ -25,7 +26,7 @@ class RoleBasedPermission(permissions.BasePermission):
         if not required_perm:
             return False
 
-        return request.user.has_perm(required_perm)
+        return has_role_permission(request.user, required_perm)
 
 
 class CustomerVerificationRequired(permissions.BasePermission):
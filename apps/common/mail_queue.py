@@ -0,0 +1,136 @@
+"""
+Outbound mail queue.
+
+Request handlers enqueue messages into a Redis list and return immediately; the
+``send_queued_mail`` worker delivers them over one persistent connection of the
+configured ``EMAIL_BACKEND`` (SMTP/MailHog in docker, locmem in tests).
+
+Delivery is at least once: a worker moves the messages it claims into its own
+processing list (LMOVE) and only removes them once sent. Whatever a crashed worker
+left there goes back to the queue when it starts again (``recover``).
+"""
+
+import json
+import logging
+
+import redis
+from django.conf import settings
+from django.core.mail import EmailMessage, send_mail
+
+from apps.common.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+redis_client = get_redis_client("queue")
+
+MAIL_QUEUE_KEY = "mail:outbox"
+MAIL_DEAD_LETTER_KEY = "mail:dead"
+
+
+def processing_key(worker_id: str) -> str:
+    return f"mail:processing:{worker_id}"
+
+
+def enqueue_mail(subject: str, message: str, recipient_list: list[str], from_email: str | None = None):
+    """Queue a plain-text email. Falls back to sending inline if the queue is disabled or Redis is down."""
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+
+    if settings.MAIL_QUEUE_ENABLED:
+        payload = {
+            "subject": subject,
+            "body": message,
+            "from_email": from_email,
+            "to": list(recipient_list),
+            "attempts": 0,
+        }
+        try:
+            redis_client.rpush(MAIL_QUEUE_KEY, json.dumps(payload))
+            return
+        except redis.RedisError as e:
+            logger.warning(f"Mail queue unavailable, sending inline: {e}")
+
+    send_mail(subject, message, from_email, recipient_list)
+
+
+def _finish(worker_id: str, raw: str, destination: str | None = None, payload: dict | None = None):
+    """Remove a claimed message from the processing list, moving it to ``destination`` in the same step."""
+    pipe = redis_client.pipeline()
+    pipe.lrem(processing_key(worker_id), 1, raw)
+    if destination:
+        pipe.rpush(destination, json.dumps(payload) if payload is not None else raw)
+    pipe.execute()
+
+
+def _requeue(worker_id: str, raw: str, payload: dict, error: Exception):
+    payload["attempts"] = payload.get("attempts", 0) + 1
+    payload["last_error"] = str(error)
+
+    if payload["attempts"] >= settings.MAIL_QUEUE_MAX_ATTEMPTS:
+        logger.error(f"Giving up on mail to {payload.get('to')} after {payload['attempts']} attempts: {error}")
+        _finish(worker_id, raw, MAIL_DEAD_LETTER_KEY, payload)
+    else:
+        _finish(worker_id, raw, MAIL_QUEUE_KEY, payload)
+
+
+def recover(worker_id: str) -> int:
+    """Hand back the messages an earlier run of this worker claimed but did not finish, in their order."""
+    key = processing_key(worker_id)
+    recovered = 0
+    while redis_client.lmove(key, MAIL_QUEUE_KEY, "RIGHT", "LEFT") is not None:
+        recovered += 1
+    return recovered
+
+
+def claim_batch(worker_id: str, batch_size: int, timeout: float = 0) -> list[tuple[str, dict]]:
+    """
+    Move up to ``batch_size`` queued messages to the worker's processing list, blocking up
+    to ``timeout`` seconds for the first one. Returns ``(raw entry, payload)`` pairs.
+    """
+    key = processing_key(worker_id)
+    raw = []
+    if timeout:
+        first = redis_client.blmove(MAIL_QUEUE_KEY, key, timeout, "LEFT", "RIGHT")
+        if first is None:
+            return []
+        raw.append(first)
+
+    pipe = redis_client.pipeline(transaction=False)
+    for _ in range(batch_size - len(raw)):
+        pipe.lmove(MAIL_QUEUE_KEY, key, "LEFT", "RIGHT")
+    raw.extend(item for item in pipe.execute() if item is not None)
+
+    batch = []
+    for item in raw:
+        try:
+            batch.append((item, json.loads(item)))
+        except ValueError:
+            logger.error(f"Dead-lettering malformed mail queue entry: {item!r}")
+            _finish(worker_id, item, MAIL_DEAD_LETTER_KEY)
+    return batch
+
+
+def deliver_batch(worker_id: str, batch: list[tuple[str, dict]], connection) -> int:
+    """
+    Send a claimed ``batch`` over an already opened ``connection``, removing each message
+    from the processing list once sent. A failed message is re-queued (or dead-lettered
+    after MAIL_QUEUE_MAX_ATTEMPTS). Returns the number of messages sent.
+    """
+    sent = 0
+    for index, (raw, payload) in enumerate(batch):
+        message = EmailMessage(
+            subject=payload["subject"],
+            body=payload["body"],
+            from_email=payload["from_email"],
+            to=payload["to"],
+            connection=connection,
+        )
+        try:
+            sent += connection.send_messages([message]) or 0
+        except Exception as e:  # noqa: BLE001 - any backend error means "retry later"
+            _requeue(worker_id, raw, payload, e)
+            # The connection is likely broken; hand the rest back to the queue untouched
+            for pending, _ in batch[index + 1 :]:
+                _finish(worker_id, pending, MAIL_QUEUE_KEY)
+            raise
+        _finish(worker_id, raw)
+    return sent
@@ -0,0 +1,78 @@
+import gzip
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.text import compress_string
+from rest_framework.test import APIClient
+
+from apps.common.conditional import PAYLOAD_PREFIX, payload_client
+from apps.common.middleware import CompressionMiddleware
+from apps.users.models import User
+from apps.wallets.models import Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure gzip on GET /menus and a transaction page: payload sizes, the cost of compressing per request, and "
+        "a menus request served from the precompressed payload in Redis against one rendered from the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--week-offset", type=int, default=0)
+        parser.add_argument("--email", help="User to send the requests as (default: one with transactions)")
+
+    def handle(self, *args, **options):
+        if options["iterations"] <= 0:
+            raise CommandError("--iterations must be positive")
+        self.iterations = options["iterations"]
+        if options["email"]:
+            user = User.objects.filter(email=options["email"]).first()
+        else:
+            user = User.objects.filter(id__in=Transaction.objects.values("balance__user")[:1]).first()
+        if user is None:
+            raise CommandError("No such user, run `manage.py generate_data` or pass --email")
+
+        client = APIClient(SERVER_NAME="localhost")
+        client.force_authenticate(user)
+        menus = f"/menus?week_offset={options['week_offset']}"
+
+        for label, url in [("menus week", menus), ("transaction page", "/wallets/me/transactions/")]:
+            response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f"GET {url} returned {response.status_code}")
+            content = response.content
+            compressed = compress_string(content, max_random_bytes=CompressionMiddleware.max_random_bytes)
+            if gzip.decompress(compressed) != content:
+                raise CommandError(f"{label}: gzip round trip changed the body")
+            compress_ms = self._time(lambda content=content: compress_string(content))
+            self.stdout.write(
+                f"{label}: {len(content):,} bytes, gzipped {len(compressed):,} bytes "
+                f"({len(compressed) / len(content):.0%}), compressing {compress_ms:.3f} ms"
+            )
+
+        # Without a cached payload the view queries, serializes, renders and compresses
+        def cold():
+            for key in payload_client.scan_iter(f"{PAYLOAD_PREFIX}*"):
+                payload_client.delete(key)
+            return client.get(menus, HTTP_ACCEPT_ENCODING="gzip")
+
+        def cached():
+            return client.get(menus, HTTP_ACCEPT_ENCODING="gzip")
+
+        cold_ms = self._time(cold)
+        cached()
+        cached_ms = self._time(cached)
+        self.stdout.write(
+            f"GET {menus} (gzip)   rendered {cold_ms:>8.2f} ms   cached payload {cached_ms:>8.2f} ms   "
+            f"{cold_ms / cached_ms:>5.1f}x"
+        )
+
+    def _time(self, fn):
+        samples = []
+        for _ in range(self.iterations):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples) * 1e3
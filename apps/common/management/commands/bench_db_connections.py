@@ -0,0 +1,60 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.db.models import Sum
+
+from apps.users.models import User
+from apps.wallets.models import Balance
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per-request database cost of connecting for every request (the old CONN_MAX_AGE=0 "
+        "behaviour) with the configured connection handling (persistent connections or the psycopg pool)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        if options["iterations"] <= 0:
+            raise CommandError("--iterations must be positive")
+        self.iterations = options["iterations"]
+
+        user = User.objects.filter(is_active=True).first()
+        if user is None:
+            raise CommandError("No users, run `manage.py generate_data` first")
+
+        def request():
+            # Roughly what a JWT-authenticated wallet call does: load the user, then read their balance
+            User.objects.get(pk=user.pk)
+            Balance.objects.filter(user_id=user.pk).aggregate(Sum("current_balance"))
+
+        db = connection.settings_dict
+        pooled = "pool" in db.get("OPTIONS", {})
+        configured = "psycopg pool" if pooled else f"CONN_MAX_AGE={db['CONN_MAX_AGE']}"
+        self.stdout.write(f"{connection.vendor}, {configured}, {self.iterations} requests")
+
+        # With a pool, closing just returns the connection, so this row shows the checkout cost
+        self._report("pool checkout per request" if pooled else "connect per request", request, reconnect=True)
+        self._report(f"configured ({configured})", request, reconnect=False)
+
+    def _report(self, label, request, reconnect):
+        connection.close()
+        samples = []
+        for _ in range(self.iterations):
+            start = time.perf_counter()
+            request()
+            # What the request_finished signal does at the end of every request
+            if reconnect:
+                connection.close()
+            else:
+                close_old_connections()
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        p50 = samples[len(samples) // 2] * 1e3
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e3
+        mean = statistics.fmean(samples) * 1e3
+        self.stdout.write(f"{label:<40} p50 {p50:>8.3f} ms   p99 {p99:>8.3f} ms   mean {mean:>8.3f} ms")
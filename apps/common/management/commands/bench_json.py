@@ -0,0 +1,84 @@
+import io
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.common.parsers import ORJSONParser
+from apps.common.renderers import ORJSONRenderer
+from apps.menus.views import MenusView
+from apps.wallets.models import Transaction
+from apps.wallets.serializers import TransactionPublicSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's JSONRenderer/JSONParser with the orjson ones on a week of menus (GET /menus) and a large "
+        "transaction page, and check that both renderers produce the same bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--week-offset", type=int, default=0)
+        parser.add_argument("--page-size", type=int, default=500, help="Transactions on the page")
+
+    def handle(self, *args, **options):
+        if options["iterations"] <= 0 or options["page_size"] <= 0:
+            raise CommandError("--iterations and --page-size must be positive")
+        self.iterations = options["iterations"]
+
+        mismatches = 0
+        for label, data in [
+            ("menus week", self._menus_week(options["week_offset"])),
+            ("transaction page", self._transaction_page(options["page_size"])),
+        ]:
+            stock = JSONRenderer().render(data)
+            fast = ORJSONRenderer().render(data)
+            same = stock == fast
+            mismatches += not same
+            self.stdout.write(f"{label}: {len(stock):,} bytes, identical output: {'yes' if same else 'NO'}")
+
+            render_stock = self._time(lambda data=data: JSONRenderer().render(data))
+            render_fast = self._time(lambda data=data: ORJSONRenderer().render(data))
+            self._report("  render", render_stock, render_fast)
+
+            parse_stock = self._time(lambda body=stock: JSONParser().parse(io.BytesIO(body)))
+            parse_fast = self._time(lambda body=stock: ORJSONParser().parse(io.BytesIO(body)))
+            self._report("  parse", parse_stock, parse_fast)
+
+        if mismatches:
+            raise CommandError(f"{mismatches} payload(s) rendered differently")
+
+    def _menus_week(self, week_offset):
+        # Same data the view hands to the renderer, serializers included
+        request = Request(APIRequestFactory().get("/menus", {"week_offset": week_offset}))
+        view = MenusView(request=request, args=(), kwargs={}, format_kwarg=None)
+        data = view.list(request).data
+        if not data["results"]:
+            raise CommandError("No menus in that week, run `manage.py generate_data` or pass --week-offset")
+        return data
+
+    def _transaction_page(self, page_size):
+        # The staff ledger, so the page is full however the data is spread across balances
+        transactions = Transaction.objects.select_related("order").order_by("-created_at")[:page_size]
+        results = TransactionPublicSerializer(transactions, many=True).data
+        if not results:
+            raise CommandError("No transactions, run `manage.py generate_data` first")
+        return {"count": len(results), "next": None, "previous": None, "results": results}
+
+    def _time(self, fn):
+        samples = []
+        for _ in range(self.iterations):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples) * 1e3
+
+    def _report(self, label, stock_ms, fast_ms):
+        self.stdout.write(
+            f"{label:<10} stock {stock_ms:>8.3f} ms   orjson {fast_ms:>8.3f} ms   {stock_ms / fast_ms:>5.1f}x"
+        )
@@ -0,0 +1,53 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from apps.common.pagination import estimate_count, fast_count
+from apps.wallets.models import Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare exact COUNT(*), planner estimates and count-less page fetches on the transaction ledger, "
+        "both unfiltered (staff) and for the largest balance (customer history)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if options["iterations"] <= 0 or options["page_size"] <= 0:
+            raise CommandError("--iterations and --page-size must be positive")
+        self.iterations = options["iterations"]
+        page_size = options["page_size"]
+
+        ledger = Transaction.objects.select_related("order")
+        largest = (
+            Transaction.objects.values("balance_id").annotate(rows=Count("id")).order_by("-rows").first() or {}
+        ).get("balance_id")
+
+        cases = [("all transactions", ledger)]
+        if largest:
+            cases.append(("largest balance", ledger.filter(balance_id=largest)))
+
+        for label, qs in cases:
+            self.stdout.write(f"{label}: exact {qs.count()}, estimate {estimate_count(qs)}")
+            self._report("  COUNT(*)", lambda qs=qs: qs.count())
+            self._report("  estimate_count", lambda qs=qs: estimate_count(qs))
+            self._report("  fast_count", lambda qs=qs: fast_count(qs))
+            # What ?count=false costs: just the page plus one look-ahead row
+            self._report("  page fetch (no count)", lambda qs=qs: list(qs[: page_size + 1]))
+
+    def _report(self, label, fn):
+        samples = []
+        for _ in range(self.iterations):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        p50 = samples[len(samples) // 2] * 1e3
+        mean = statistics.fmean(samples) * 1e3
+        self.stdout.write(f"{label:<30} p50 {p50:>9.2f} ms   mean {mean:>9.2f} ms")
@@ -0,0 +1,103 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.constants import UserRole
+from apps.common.drf_permissions import CustomerVerificationRequired, IsOwnerOrAdmin, RoleBasedPermission
+from apps.common.rbac import ROLE_PERMISSION_MATRIX, UserGrants, has_role_permission
+
+User = get_user_model()
+
+
+class _Request:
+    def __init__(self, user):
+        self.user = user
+
+
+class _View:
+    required_permission = "orders.add_order"
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-request permission-check cost of the in-memory RBAC engine."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=100_000)
+        parser.add_argument(
+            "--email",
+            help="Existing user to compare against Django's DB-backed has_perm (permission cache reset per request)",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        if iterations <= 0:
+            raise CommandError("--iterations must be positive")
+        self.iterations = iterations
+
+        perms = sorted(set().union(*ROLE_PERMISSION_MATRIX.values()))
+        users = {
+            "staff": User(email="staff@utm.md", role=UserRole.STAFF, is_verified=True),
+            "customer_verified": User(email="verified@utm.md", role=UserRole.CUSTOMER, is_verified=True),
+            "customer_unverified": User(email="unverified@utm.md", role=UserRole.CUSTOMER, is_verified=False),
+        }
+        for role, user in users.items():
+            # Grants as loaded by the first check of a request
+            user._rbac_grants = UserGrants(frozenset({role}), frozenset())
+
+        self.stdout.write(f"Matrix: {len(ROLE_PERMISSION_MATRIX)} roles, {len(perms)} distinct permissions")
+
+        for role, user in users.items():
+            granted = [perm for perm in perms if perm in ROLE_PERMISSION_MATRIX[role]]
+            elapsed = self._time(lambda user=user, granted=granted: [has_role_permission(user, p) for p in granted])
+            self._report(f"has_role_permission ({role})", elapsed, iterations * len(granted))
+
+        # A verified-customer write request runs all three DRF permission classes
+        request = _Request(users["customer_verified"])
+        view = _View()
+        order = type("Order", (), {"user": request.user})()
+        checks = (
+            lambda: RoleBasedPermission().has_permission(request, view),
+            lambda: CustomerVerificationRequired().has_permission(request, view),
+            lambda: IsOwnerOrAdmin().has_object_permission(request, view, order),
+        )
+        elapsed = self._time(lambda: [check() for check in checks])
+        self._report("per request (3 DRF permission classes)", elapsed, iterations)
+
+        if options["email"]:
+            try:
+                db_user = User.objects.get(email=options["email"])
+            except User.DoesNotExist as err:
+                raise CommandError(f"User {options['email']} does not exist") from err
+
+            db_iterations = max(1, iterations // 100)
+
+            def db_check():
+                for attr in ("_perm_cache", "_user_perm_cache", "_group_perm_cache"):
+                    db_user.__dict__.pop(attr, None)
+                db_user.has_perm(view.required_permission)
+
+            start = time.perf_counter()
+            for _ in range(db_iterations):
+                db_check()
+            self._report("Django ModelBackend has_perm (cold)", time.perf_counter() - start, db_iterations)
+
+            def cached_check():
+                # New user instance per request: grants come from Redis
+                db_user.__dict__.pop("_rbac_grants", None)
+                has_role_permission(db_user, view.required_permission)
+
+            cached_check()
+            start = time.perf_counter()
+            for _ in range(db_iterations):
+                cached_check()
+            self._report("has_role_permission (cached grants)", time.perf_counter() - start, db_iterations)
+
+    def _time(self, fn):
+        start = time.perf_counter()
+        for _ in range(self.iterations):
+            fn()
+        return time.perf_counter() - start
+
+    def _report(self, label, elapsed, count):
+        self.stdout.write(f"{label:<45} {elapsed / count * 1e9:>10.0f} ns/op  ({count} ops)")
@@ -0,0 +1,82 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a worker does before serving its first request: configure Django and load every URLconf/view
+BOOT = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns; "
+    "from django.core.handlers.wsgi import WSGIHandler; WSGIHandler()"
+)
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start (django.setup() + URLconf + middleware) in fresh interpreters with -X importtime, "
+        "and list the top-level imports that cost the most. --json writes the result for tracking over time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--top", type=int, default=15, help="Top-level imports to list")
+        parser.add_argument("--json", type=Path, help="Write the modules count and timings to this JSON file")
+
+    def handle(self, *args, **options):
+        if options["repeat"] <= 0:
+            raise CommandError("--repeat must be positive")
+
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings")}
+        runs = []
+        for _ in range(options["repeat"]):
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", BOOT],
+                cwd=settings.BASE_DIR,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            if result.returncode != 0:
+                raise CommandError(f"Boot failed:\n{result.stderr[-2000:]}")
+            runs.append(self._top_level_imports(result.stderr))
+            module_count = sum(1 for line in result.stderr.splitlines() if IMPORTTIME_LINE.match(line))
+
+        # Median per module across runs, so one slow run (disk cache, noisy neighbour) doesn't dominate
+        modules = {name for run in runs for name in run}
+        imports_ms = {name: statistics.median(run.get(name, 0) for run in runs) / 1e3 for name in modules}
+        total_ms = statistics.median(sum(run.values()) for run in runs) / 1e3
+
+        # Timings are noisy on shared machines; the module count is the stable number to compare
+        self.stdout.write(f"Modules imported: {module_count}")
+        self.stdout.write(f"Cumulative import time (median of {options['repeat']} runs): {total_ms:.1f} ms")
+        for name, ms in sorted(imports_ms.items(), key=lambda item: -item[1])[: options["top"]]:
+            self.stdout.write(f"  {ms:>8.1f} ms  {name}")
+
+        if options["json"]:
+            result = {
+                "modules": module_count,
+                "total_ms": round(total_ms, 1),
+                "imports_ms": {name: round(ms, 1) for name, ms in imports_ms.items()},
+            }
+            options["json"].write_text(json.dumps(result, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(f"Wrote {options['json']}")
+
+    @staticmethod
+    def _top_level_imports(stderr):
+        """Cumulative microseconds of every import not nested in another import."""
+        imports = {}
+        for line in stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            # Nesting is the indentation after the second "|": one space means top level
+            if match and len(match.group(3)) == 1:
+                imports[match.group(4)] = imports.get(match.group(4), 0) + int(match.group(2))
+        return imports
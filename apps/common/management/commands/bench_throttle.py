@@ -0,0 +1,52 @@
+import statistics
+import time
+
+import redis
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.throttling import RedisRateLimiter, rate_limiter
+
+
+class Command(BaseCommand):
+    help = "Microbenchmark the Redis rate limiter: per-check latency and fail-open overhead without Redis."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=10_000)
+        parser.add_argument("--keys", type=int, default=100, help="Distinct buckets to spread hits over")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        if iterations <= 0 or options["keys"] <= 0:
+            raise CommandError("--iterations and --keys must be positive")
+
+        keys = [f"bench:{i}" for i in range(options["keys"])]
+
+        try:
+            rate_limiter.client.ping()
+        except redis.RedisError as e:
+            raise CommandError(f"Redis is not reachable: {e}") from e
+
+        self._report("redis sliding window", self._measure(rate_limiter, keys, iterations))
+        rate_limiter.client.delete(*(rate_limiter.key_prefix + key for key in keys))
+
+        # Unroutable Redis: the first call pays the connect timeout, the rest hit the cool-down short-circuit
+        down = RedisRateLimiter(client=redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1))
+        start = time.perf_counter()
+        down.hit("bench:down", 10, 60)
+        self.stdout.write(f"{'redis down (first call)':<30} {(time.perf_counter() - start) * 1e3:>9.2f} ms")
+        self._report("redis down (fail-open)", self._measure(down, keys, iterations))
+
+    def _measure(self, limiter, keys, iterations):
+        samples = []
+        for i in range(iterations):
+            start = time.perf_counter()
+            limiter.hit(keys[i % len(keys)], 1_000_000, 60)
+            samples.append(time.perf_counter() - start)
+        return samples
+
+    def _report(self, label, samples):
+        samples = sorted(samples)
+        p50 = samples[len(samples) // 2] * 1e6
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6
+        mean = statistics.fmean(samples) * 1e6
+        self.stdout.write(f"{label:<30} p50 {p50:>8.1f} us   p99 {p99:>8.1f} us   mean {mean:>8.1f} us")
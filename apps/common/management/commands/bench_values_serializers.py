@@ -0,0 +1,119 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Prefetch
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.menus.models import Menu, MenuItem
+from apps.menus.serializers import RESERVED_ORDER_STATUSES, MenuSerializer, MenuValuesSerializer
+from apps.orders.models import Order, OrderItem
+from apps.orders.serializers import OrderListSerializer, OrderListValuesSerializer
+from apps.wallets.models import Transaction
+from apps.wallets.serializers import TransactionPublicSerializer, TransactionPublicValuesSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the ModelSerializers with the values()-based serializers on upcoming menus, an order page and a "
+        "transaction page, and check that both produce the same JSON. Times include the queries; 'python only' "
+        "leaves out the time spent in the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        if options["iterations"] <= 0 or options["page_size"] <= 0:
+            raise CommandError("--iterations and --page-size must be positive")
+        self.iterations = options["iterations"]
+        page_size = options["page_size"]
+
+        # What the views fetched before (prefetches included), so the baseline has no N+1
+        menus = Menu.objects.prefetch_related(
+            Prefetch(
+                "menu_items",
+                queryset=MenuItem.objects.select_related("item__category").prefetch_related(
+                    Prefetch(
+                        "order_items",
+                        queryset=OrderItem.objects.filter(order__status__in=RESERVED_ORDER_STATUSES),
+                        to_attr="reserved_order_items",
+                    )
+                ),
+            )
+        ).filter(start_time__gte=timezone.now())
+        orders = Order.objects.select_related("menu").prefetch_related("items__menu_item__item")
+        transactions = Transaction.objects.select_related("order")
+
+        cases = [
+            ("upcoming menus", menus.order_by("start_time"), MenuSerializer, MenuValuesSerializer),
+            ("order page", orders.order_by("-reservation_time"), OrderListSerializer, OrderListValuesSerializer),
+            (
+                "transaction page",
+                transactions.order_by("-created_at"),
+                TransactionPublicSerializer,
+                TransactionPublicValuesSerializer,
+            ),
+        ]
+
+        mismatches = 0
+        for label, queryset, serializer_class, values_serializer_class in cases:
+            queryset = queryset[:page_size]
+            instances = list(queryset.all())
+            rows = list(values_serializer_class().values(queryset))
+            if not instances:
+                raise CommandError(f"No rows for {label}, run `manage.py generate_data` first")
+
+            def drf(instances, serializer_class=serializer_class):
+                return serializer_class(instances, many=True).data
+
+            def values(rows, values_serializer_class=values_serializer_class):
+                return values_serializer_class().serialize(rows)
+
+            expected = JSONRenderer().render(drf(instances))
+            same = expected == JSONRenderer().render(values(rows))
+            mismatches += not same
+            self.stdout.write(
+                f"{label}: {len(instances)} rows, {len(expected):,} bytes, identical JSON: {'yes' if same else 'NO'}"
+            )
+            serializer = values_serializer_class()
+            self._report(
+                self._time(lambda drf=drf, queryset=queryset: drf(queryset.all())),
+                self._time(
+                    lambda values=values, queryset=queryset, serializer=serializer: values(serializer.values(queryset))
+                ),
+            )
+
+        if mismatches:
+            raise CommandError(f"{mismatches} case(s) produced different JSON")
+
+    def _time(self, fn):
+        """Median total and Python-side (total minus time in the database) milliseconds."""
+        totals, python = [], []
+        for _ in range(self.iterations):
+            sql = [0.0]
+
+            def timed_execute(execute, sql_text, params, many, context, sql=sql):
+                start = time.perf_counter()
+                try:
+                    return execute(sql_text, params, many, context)
+                finally:
+                    sql[0] += time.perf_counter() - start
+
+            with connection.execute_wrapper(timed_execute):
+                start = time.perf_counter()
+                fn()
+                total = time.perf_counter() - start
+            totals.append(total)
+            python.append(total - sql[0])
+        return statistics.median(totals) * 1e3, statistics.median(python) * 1e3
+
+    def _report(self, drf, values):
+        for label, drf_ms, values_ms in [("  end to end", drf[0], values[0]), ("  python only", drf[1], values[1])]:
+            self.stdout.write(
+                f"{label:<14} ModelSerializer {drf_ms:>8.2f} ms   values() {values_ms:>8.2f} ms   "
+                f"{drf_ms / values_ms:>5.1f}x"
+            )
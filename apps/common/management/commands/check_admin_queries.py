@@ -0,0 +1,104 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.webhooks.models import WebhookEvent
+
+User = get_user_model()
+
+MIN_ROWS = 2
+
+
+def _seed_blacklisted_tokens(count):
+    tokens = OutstandingToken.objects.filter(blacklistedtoken__isnull=True)[:count]
+    BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in tokens])
+
+
+def _seed_webhook_events(count):
+    WebhookEvent.objects.bulk_create(
+        [
+            WebhookEvent(event_id=f"admin-query-check-{i}", event_type="check", payload={}, processed_at=timezone.now())
+            for i in range(count)
+        ]
+    )
+
+
+# Admins of models that generate_data leaves empty; rows are created inside the rolled-back transaction
+SEEDERS = {
+    "token_blacklist.blacklistedtoken": _seed_blacklisted_tokens,
+    "webhooks.webhookevent": _seed_webhook_events,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every admin changelist with 1 and with N rows per page and fail if the query count differs, "
+        "i.e. if a changelist issues per-row queries. Run after generate_data: a model with fewer than 2 rows "
+        "(and no seeder here) fails the check."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20, help="Rows per page for the second render")
+        parser.add_argument("--models", nargs="*", help="Limit to app_label.model_name entries")
+
+    def handle(self, *args, **options):
+        if options["rows"] < 2:
+            raise CommandError("--rows must be at least 2")
+        selected = {name.lower() for name in options["models"] or []}
+
+        failures = []
+        # Everything (including the throwaway superuser) is rolled back at the end
+        with transaction.atomic():
+            client = Client(HTTP_HOST="localhost")
+            client.force_login(User.objects.create_superuser(email="admin-query-check@example.com", password=None))
+
+            for model, model_admin in sorted(admin.site._registry.items(), key=lambda item: item[0]._meta.label):
+                label = model._meta.label_lower
+                if selected and label not in selected:
+                    continue
+
+                rows = model._default_manager.count()
+                if rows < MIN_ROWS and label in SEEDERS:
+                    SEEDERS[label](MIN_ROWS - rows)
+                    rows = model._default_manager.count()
+                if rows < MIN_ROWS:
+                    # One row cannot tell a fixed query count from a per-row one
+                    self.stdout.write(self.style.ERROR(f"{label:<40} only {rows} row(s)"))
+                    failures.append(f"{label} (too few rows)")
+                    continue
+
+                url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+                one = self._count_queries(client, model_admin, url, 1)
+                many = self._count_queries(client, model_admin, url, options["rows"])
+
+                status = "OK" if one == many else "SCALES"
+                self.stdout.write(
+                    f"{label:<40} {one:>3} queries @1 row  {many:>3} queries @{options['rows']} rows  {status}"
+                )
+                if one != many:
+                    failures.append(f"{label} (per-row queries)")
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"Admin changelists not verified: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All admin changelists run a fixed number of queries per page"))
+
+    def _count_queries(self, client, model_admin, url, per_page):
+        original = model_admin.list_per_page
+        model_admin.list_per_page = per_page
+        try:
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get(url)
+        finally:
+            model_admin.list_per_page = original
+
+        if response.status_code != 200:
+            raise CommandError(f"{url} returned {response.status_code}")
+        return len(ctx.captured_queries)
@@ -0,0 +1,332 @@
+import json
+import re
+import statistics
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import redis
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.common.conditional import KEY_PREFIX, PAYLOAD_PREFIX, payload_client, redis_client
+from apps.common.constants import UserRole
+from apps.menus.models import Menu
+from apps.orders.models import Order
+from apps.users.models import User
+from apps.wallets.models import Transaction
+
+DEFAULT_BUDGETS = Path(settings.BASE_DIR) / "loadtest" / "perf_budgets.json"
+
+# Not exercised: redirects to / callbacks from external services
+EXCLUDED_ROUTES = {"auth/microsoft", "auth/microsoft/callback", "webhooks/stripe/"}
+
+# Stub views whose get() argument names don't match the URL kwargs (menuId vs menu_id, ...): every request
+# raises TypeError, so there is nothing to budget until they are fixed
+KNOWN_BROKEN_ROUTES = {
+    "items/<uuid:itemId>",
+    "categories/<uuid:id>",
+    "menus/<uuid:menuId>",
+    "menus/<uuid:menuId>/items",
+    "menus/<uuid:menuId>/items/<uuid:itemId>",
+    "users/<str:accountNo>",
+}
+
+# Read scenarios that must not return 200, per role
+EXPECTED_STATUS = {
+    # Deprecated stubs
+    "categories": {"customer": 501, "staff": 501},
+    "items": {"customer": 501, "staff": 501},
+    "orders/<uuid:order_id>": {"customer": 501, "staff": 501},
+    "users/me/balance": {"customer": 501, "staff": 501},
+    "users/me/orders": {"customer": 501, "staff": 501},
+    "users/me/transactions": {"customer": 501, "staff": 501},
+    # Staff only
+    "orders/find/<str:order_no>": {"customer": 403},
+    "reports/daily-sales/": {"customer": 403},
+    "reports/daily-sales/categories/": {"customer": 403},
+    "reports/exports/order-items/": {"customer": 403},
+    "reports/exports/orders/": {"customer": 403},
+    "reports/exports/transactions/": {"customer": 403},
+    "wallets/<uuid:user_id>/": {"customer": 403},
+    "wallets/<uuid:user_id>/transactions/": {"customer": 403},
+    "wallets/<uuid:user_id>/transactions/<uuid:pk>/": {"customer": 403},
+    # No session_id: a real one would be looked up at Stripe
+    "wallets/stripe/session-status/": {"customer": 400, "staff": 400},
+    # The customer's transaction, not the staff member's own
+    "wallets/me/transactions/<uuid:id>/": {"staff": 404},
+}
+
+CONVERTER = re.compile(r"<(?:\w+:)?(\w+)>")
+
+
+@contextmanager
+def _count_redis_commands():
+    """Count commands sent by any redis client (pipelines count each queued command)."""
+    counter = {"commands": 0}
+    execute_command = redis.Redis.execute_command
+    pipeline_execute = redis.client.Pipeline.execute
+
+    def counted_execute_command(self, *args, **kwargs):
+        counter["commands"] += 1
+        return execute_command(self, *args, **kwargs)
+
+    def counted_pipeline_execute(self, *args, **kwargs):
+        counter["commands"] += len(self.command_stack)
+        return pipeline_execute(self, *args, **kwargs)
+
+    redis.Redis.execute_command = counted_execute_command
+    redis.client.Pipeline.execute = counted_pipeline_execute
+    try:
+        yield counter
+    finally:
+        redis.Redis.execute_command = execute_command
+        redis.client.Pipeline.execute = pipeline_execute
+
+
+def _flush_payloads():
+    """Drop the cached response payloads (apps.common.conditional), so a run queries, serializes and renders."""
+    keys = list(payload_client.scan_iter(f"{PAYLOAD_PREFIX}*"))
+    if keys:
+        payload_client.delete(*keys)
+
+
+def _flush_etags():
+    """Drop the ETag scope versions, so the next request mints them like the first one after a change."""
+    keys = list(redis_client.scan_iter(f"{KEY_PREFIX}*"))
+    if keys:
+        redis_client.delete(*keys)
+
+
+def _iter_routes(patterns, prefix=""):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace == "admin":
+                continue
+            yield from _iter_routes(pattern.url_patterns, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern):
+            yield prefix + str(pattern.pattern), pattern
+
+
+class Command(BaseCommand):
+    help = (
+        "Exercise every API route (GET as customer and staff, plus the order write flow) against data from "
+        "generate_data, and check the status and the worst run's SQL query and Redis command counts per endpoint "
+        "against budgets. The first run of an endpoint is cold (no ETag versions or cached payloads)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS)
+        parser.add_argument("--report", type=Path, help="Write the measurements as JSON (diffable between commits)")
+        parser.add_argument("--update", action="store_true", help="Rewrite the budgets file from this run")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per endpoint for the latency median")
+        parser.add_argument("--domain", default="loadtest.utm.md", help="generate_data --domain")
+        parser.add_argument("--password", default="LoadTest-2025!", help="generate_data --password")
+
+    def handle(self, *args, **options):
+        if options["repeat"] <= 0:
+            raise CommandError("--repeat must be positive")
+        self.repeat = options["repeat"]
+        self.results = {}
+
+        # Nothing the scenarios write survives the run; rate limits would make repeated runs diverge
+        with transaction.atomic(), override_settings(RATELIMIT_ENABLED=False):
+            self._prepare(options["domain"], options["password"])
+            self._read_endpoints()
+            self._order_flow()
+            transaction.set_rollback(True)
+
+        report = dict(sorted(self.results.items()))
+        if options["report"]:
+            options["report"].write_text(json.dumps(report, indent=2) + "\n")
+
+        errors = [
+            f"{key}: status {row['status']} != {row['expected']}"
+            for key, row in report.items()
+            if row["status"] != row["expected"]
+        ]
+        if errors:
+            # Counts of an unexpected response are never a budget, whether checking or updating
+            raise CommandError(f"{len(errors)} endpoint(s) returned an unexpected status:\n" + "\n".join(errors))
+
+        if options["update"]:
+            budgets = {key: {"queries": row["queries"], "redis": row["redis"]} for key, row in report.items()}
+            options["budgets"].write_text(json.dumps(budgets, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(budgets)} budgets to {options['budgets']}"))
+            return
+
+        self._check(report, options["budgets"])
+
+    def _prepare(self, domain, password):
+        self.password = password
+        self.customer = (
+            User.objects.filter(email__endswith=f"@{domain}", role=UserRole.CUSTOMER, orders__isnull=False)
+            .order_by("email")
+            .first()
+        )
+        self.staff = User.objects.filter(email__endswith=f"@{domain}", role=UserRole.STAFF, is_staff=True).first()
+        if not self.customer or not self.staff:
+            raise CommandError(f"No generated customer and staff users for @{domain}, run `manage.py generate_data`")
+
+        self.future_menu = (
+            Menu.objects.filter(start_time__gt=timezone.now(), menu_items__isnull=False).order_by("start_time").first()
+        )
+        if not self.future_menu:
+            raise CommandError("No upcoming menu, run `manage.py generate_data --future-weeks 1`")
+
+        order = Order.objects.filter(user=self.customer).first()
+        own_transaction = Transaction.objects.filter(balance__user=self.customer).first()
+        self.params = {
+            "user_id": self.customer.id,
+            "order_id": order.id,
+            "order_no": order.order_no,
+            "pk": own_transaction.id,
+            "accountNo": self.customer.email,
+            "jti": "unknown",
+            "menuId": self.future_menu.id,
+            "itemId": self.future_menu.menu_items.first().id,
+        }
+        self.transaction_id = own_transaction.id
+
+        # Server errors are recorded as a 500 status instead of aborting the run
+        self.clients = {"anonymous": APIClient(SERVER_NAME="localhost", raise_request_exception=False)}
+        for role, user in (("customer", self.customer), ("staff", self.staff)):
+            # A real login, so the user has a Redis session like any client would
+            client = APIClient(SERVER_NAME="localhost", raise_request_exception=False)
+            response = client.post("/auth/login/", {"email": user.email, "password": password}, format="json")
+            if response.status_code != 200 or "access" not in response.json():
+                raise CommandError(f"Login as {user.email} failed ({response.status_code}), check --password")
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['access']}")
+            self.clients[role] = client
+
+    def _fill(self, route):
+        def value(match):
+            name = match.group(1)
+            if name == "id":
+                return str(self.transaction_id if "transactions" in route else self.customer.id)
+            if name not in self.params:
+                raise KeyError(name)
+            return str(self.params[name])
+
+        return "/" + CONVERTER.sub(value, route)
+
+    def _measure(self, key, role, method, path, data=None, expected=200, cached=False):
+        """
+        Worst counts over the runs, the first of which is cold; runs without a cached payload, or
+        with ``cached``, served from the payload cached by an unmeasured request before.
+        """
+        client = self.clients[role]
+        _flush_etags()
+        _flush_payloads()
+        if cached:
+            getattr(client, method)(path, data, format="json")
+
+        statuses, queries, commands, timings = [], [], [], []
+        for _ in range(self.repeat):
+            if not cached:
+                _flush_payloads()
+            sid = transaction.savepoint()
+            with CaptureQueriesContext(connection) as captured, _count_redis_commands() as redis_counter:
+                start = time.perf_counter()
+                # The harness' transaction never commits: run the on_commit work (cache invalidation) as a commit would
+                with TestCase.captureOnCommitCallbacks(execute=True):
+                    response = getattr(client, method)(path, data, format="json")
+                timings.append((time.perf_counter() - start) * 1e3)
+            transaction.savepoint_rollback(sid)
+
+            statuses.append(response.status_code)
+            # Savepoint statements are the harness' own, not the endpoint's
+            queries.append(sum(1 for q in captured.captured_queries if "SAVEPOINT" not in q["sql"].upper()))
+            commands.append(redis_counter["commands"])
+
+        self.results[key] = {
+            # Any run with another status is a mismatch
+            "status": next((status for status in statuses if status != expected), expected),
+            "expected": expected,
+            "queries": max(queries),
+            "redis": max(commands),
+            "p50_ms": round(statistics.median(timings), 2),
+        }
+        return response
+
+    def _read_endpoints(self):
+        for route, pattern in _iter_routes(get_resolver().url_patterns):
+            view_class = getattr(pattern.callback, "cls", None) or getattr(pattern.callback, "view_class", None)
+            if route in EXCLUDED_ROUTES or view_class is None or not hasattr(view_class, "get"):
+                continue
+            if route in KNOWN_BROKEN_ROUTES:
+                self.stderr.write(f"Skipping /{route}: known broken")
+                continue
+            try:
+                path = self._fill(route)
+            except KeyError as e:
+                self.stderr.write(f"Skipping /{route}: no value for <{e.args[0]}>")
+                continue
+
+            for role in ("customer", "staff"):
+                expected = EXPECTED_STATUS.get(route, {}).get(role, 200)
+                self._measure(f"GET /{route} [{role}]", role, "get", path, expected=expected)
+                if getattr(view_class, "cache_payload", False):
+                    key = f"GET /{route} [{role}] [cached]"
+                    self._measure(key, role, "get", path, expected=expected, cached=True)
+
+    def _order_flow(self):
+        self._measure(
+            "POST /auth/login/ [anonymous]",
+            "anonymous",
+            "post",
+            "/auth/login/",
+            {"email": self.customer.email, "password": self.password},
+        )
+
+        menu_item = self.future_menu.menu_items.first()
+        payload = {
+            "menu": str(self.future_menu.id),
+            "reservation_time": self.future_menu.start_time.isoformat(),
+            "items": [{"menu_item_id": str(menu_item.id), "quantity": 1}],
+        }
+        self._measure("POST /orders/ [customer]", "customer", "post", "/orders/", payload, expected=201)
+
+        # Capture and refund need an order that outlives the measurement savepoints
+        order = self.clients["customer"].post("/orders/", payload, format="json").json()
+        data = {"order_id": order["id"]}
+        self._measure("POST /orders/capture/ [staff]", "staff", "post", "/orders/capture/", data, expected=201)
+        self.clients["staff"].post("/orders/capture/", data, format="json")
+        self._measure("POST /orders/refund/ [staff]", "staff", "post", "/orders/refund/", data, expected=201)
+
+    def _check(self, report, budgets_path):
+        if not budgets_path.exists():
+            raise CommandError(f"{budgets_path} not found, create it with --update")
+        budgets = json.loads(budgets_path.read_text())
+
+        failures = []
+        for key, row in report.items():
+            budget = budgets.get(key)
+            if budget is None:
+                self.stdout.write(self.style.WARNING(f"{key:<60} no budget"))
+                continue
+
+            over = [
+                f"{metric} {row[metric]} > {budget[metric]}"
+                for metric in ("queries", "redis")
+                if metric in budget and row[metric] > budget[metric]
+            ]
+            if "max_ms" in budget and row["p50_ms"] > budget["max_ms"]:
+                over.append(f"p50 {row['p50_ms']}ms > {budget['max_ms']}ms")
+
+            line = f"{key:<60} {row['status']} {row['queries']:>4} queries {row['redis']:>3} redis {row['p50_ms']:>8}ms"
+            if over:
+                failures.append(f"{key}: {', '.join(over)}")
+                self.stdout.write(self.style.ERROR(f"{line}  OVER ({', '.join(over)})"))
+            else:
+                self.stdout.write(line)
+
+        if failures:
+            raise CommandError(f"{len(failures)} endpoint(s) over budget:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS(f"All {len(report)} endpoints within budget"))
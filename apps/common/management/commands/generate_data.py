@@ -0,0 +1,329 @@
+import random
+import string
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.constants import MenuType, OrderStatus, TransactionStatus, TransactionType, UserRole
+from apps.menus.models import Category, Item, Menu, MenuItem
+from apps.orders.models import Order, OrderItem
+from apps.users.models import User
+from apps.users.services import bulk_provision_users
+from apps.wallets.models import Balance, Transaction
+
+CATALOGUE = {
+    "Breakfast": [("Omelette", "18.00"), ("Pancakes", "20.00"), ("Porridge", "12.00"), ("Croissant", "10.00")],
+    "Soups": [("Borsch", "22.00"), ("Zeamă", "22.00"), ("Mushroom soup", "20.00"), ("Lentil soup", "18.00")],
+    "Main courses": [
+        ("Chicken schnitzel", "45.00"),
+        ("Pork chop", "50.00"),
+        ("Fish fillet", "55.00"),
+        ("Vegetable stew", "35.00"),
+        ("Sarmale", "40.00"),
+    ],
+    "Sides": [("Mashed potatoes", "15.00"), ("Rice", "12.00"), ("Buckwheat", "12.00"), ("Mămăligă", "10.00")],
+    "Salads": [("Greek salad", "30.00"), ("Caesar salad", "35.00"), ("Cabbage salad", "15.00")],
+    "Desserts": [("Plăcinte", "12.00"), ("Cheesecake", "25.00"), ("Fruit salad", "18.00")],
+    "Drinks": [("Compote", "8.00"), ("Tea", "6.00"), ("Coffee", "12.00"), ("Juice", "15.00")],
+}
+
+# (menu type, start hour, end hour)
+SERVICES = [(MenuType.BREAKFAST, 8, 10), (MenuType.LUNCH, 12, 15), (MenuType.DINNER, 17, 19)]
+
+# Status mix for orders of past menus
+PAST_STATUSES = [
+    (OrderStatus.COMPLETED, 0.75),
+    (OrderStatus.PAID, 0.10),
+    ("refunded", 0.07),
+    (OrderStatus.CANCELLED, 0.08),
+]
+
+LOADTEST_STAFF_LOCAL_PART = "loadtest.staff"
+
+
+def loadtest_email(index: int, domain: str) -> str:
+    return f"loadtest{index}.user@{domain}"
+
+
+@contextmanager
+def _manual_timestamps(*models):
+    """Let bulk_create keep explicit created_at/updated_at values (auto_now/auto_now_add off)."""
+    fields = [(model._meta.get_field(name), name) for model in models for name in ("created_at", "updated_at")]
+    saved = [(field, field.auto_now, field.auto_now_add) for field, _ in fields]
+    for field, _ in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a realistic dataset (users, weeks of menus, orders, ledger) with bulk_create for load and "
+        "performance testing. Users are loadtest<N>.user@<domain> plus loadtest.staff@<domain>, all sharing --password."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--weeks", type=int, default=4, help="Weeks of past menus (with orders)")
+        parser.add_argument("--future-weeks", type=int, default=1, help="Weeks of upcoming menus (open for ordering)")
+        parser.add_argument("--orders", type=int, help="Orders on past menus (default: 5 per user and week)")
+        parser.add_argument("--deposit", type=Decimal, default=Decimal("5000.00"), help="Initial deposit per user")
+        parser.add_argument("--domain", default="loadtest.utm.md")
+        parser.add_argument("--password", default="LoadTest-2025!")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, help="Random seed for reproducible datasets")
+
+    def handle(self, *args, **options):
+        if options["users"] <= 0 or options["weeks"] < 0 or options["future_weeks"] < 0:
+            raise CommandError("--users must be positive, --weeks/--future-weeks non-negative")
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.started = time.perf_counter()
+
+        users = self._users(options)
+        items = self._catalogue()
+        past_menus, future_menus = self._menus(items, options["weeks"], options["future_weeks"])
+
+        order_count = options["orders"] if options["orders"] is not None else options["users"] * options["weeks"] * 5
+        if past_menus and order_count:
+            self._orders(users, past_menus, order_count, options["deposit"])
+        else:
+            self._deposits_only(users, options["deposit"])
+
+        self._log(
+            self.style.SUCCESS(
+                f"Done: {len(users)} users, {len(past_menus)} past / {len(future_menus)} upcoming menus, "
+                f"{order_count if past_menus else 0} orders"
+            )
+        )
+
+    def _log(self, message):
+        self.stdout.write(f"[{time.perf_counter() - self.started:7.1f}s] {message}")
+
+    def _users(self, options):
+        domain = options["domain"]
+        records = [
+            {"email": loadtest_email(i, domain), "role": UserRole.CUSTOMER, "is_verified": True}
+            for i in range(options["users"])
+        ]
+        records.append({"email": f"{LOADTEST_STAFF_LOCAL_PART}@{domain}", "role": UserRole.STAFF, "is_verified": True})
+
+        # Unusable passwords skip hashing; one shared hash is set afterwards
+        report = bulk_provision_users(records, chunk_size=self.batch_size, workers=0)
+        User.objects.filter(email__endswith=f"@{domain}").update(password=make_password(options["password"]))
+        # Staff-only endpoints (IsAdminUser) check is_staff, which the role alone doesn't grant
+        User.objects.filter(email=f"{LOADTEST_STAFF_LOCAL_PART}@{domain}").update(is_staff=True)
+        self._log(f"Users: {report.created} created, {report.skipped} already present")
+
+        return list(
+            User.objects.filter(email__endswith=f"@{domain}", role=UserRole.CUSTOMER)
+            .select_related("balance")
+            .order_by("email")
+        )
+
+    def _catalogue(self):
+        items = []
+        for order, (category_name, entries) in enumerate(CATALOGUE.items()):
+            category, _ = Category.objects.get_or_create(name=category_name, defaults={"display_order": order})
+            for name, price in entries:
+                defaults = {"base_price": Decimal(price)}
+                item, _ = Item.objects.get_or_create(category=category, name=name, defaults=defaults)
+                items.append(item)
+        return items
+
+    def _menus(self, items, weeks, future_weeks):
+        today = timezone.localdate()
+        monday = today - timedelta(days=today.weekday())
+        now = timezone.now()
+
+        menus, menu_items = [], []
+        for day_offset in range(-7 * weeks, 7 * future_weeks + 7):
+            day = monday + timedelta(days=day_offset)
+            if day.weekday() >= 5:
+                continue
+            for menu_type, start_hour, end_hour in SERVICES:
+                start = timezone.make_aware(datetime.combine(day, datetime.min.time()) + timedelta(hours=start_hour))
+                menu = Menu(
+                    name=f"{menu_type.label} {day:%a %d.%m}",
+                    start_time=start,
+                    end_time=start + timedelta(hours=end_hour - start_hour),
+                    type=menu_type,
+                )
+                menus.append(menu)
+                for position, item in enumerate(self.rng.sample(items, k=min(len(items), self.rng.randint(6, 10)))):
+                    menu_items.append(
+                        MenuItem(menu=menu, item=item, display_order=position, quantity=self.rng.randint(200, 500))
+                    )
+
+        with transaction.atomic():
+            Menu.objects.bulk_create(menus, batch_size=self.batch_size)
+            MenuItem.objects.bulk_create(menu_items, batch_size=self.batch_size)
+        self._log(f"Menus: {len(menus)} with {len(menu_items)} menu items")
+
+        items_by_menu = {}
+        for menu_item in menu_items:
+            items_by_menu.setdefault(menu_item.menu_id, []).append(menu_item)
+
+        past = [(menu, items_by_menu[menu.id]) for menu in menus if menu.start_time < now]
+        future = [menu for menu in menus if menu.start_time >= now]
+        return past, future
+
+    def _order_no(self, taken):
+        chars = string.ascii_uppercase + string.digits
+        while True:
+            code = "".join(self.rng.choices(chars, k=6))
+            if code not in taken:
+                taken.add(code)
+                return code
+
+    def _deposits_only(self, users, deposit):
+        start = timezone.now()
+        ledger = []
+        for user in users:
+            user.balance.current_balance += deposit
+            ledger.append(
+                self._tx(user.balance, None, TransactionType.DEPOSIT, deposit, user.balance.current_balance, start)
+            )
+        with transaction.atomic():
+            Transaction.objects.bulk_create(ledger, batch_size=self.batch_size)
+            Balance.objects.bulk_update(
+                [user.balance for user in users], ["current_balance"], batch_size=self.batch_size
+            )
+
+    @staticmethod
+    def _tx(balance, order, tx_type, amount, remaining, at, status=TransactionStatus.COMPLETED):
+        return Transaction(
+            balance=balance,
+            order=order,
+            type=tx_type,
+            amount=amount,
+            remaining_balance=remaining,
+            status=status,
+            created_at=at,
+            updated_at=at,
+        )
+
+    def _orders(self, users, past_menus, order_count, deposit):
+        statuses, weights = zip(*PAST_STATUSES, strict=True)
+        past_menus.sort(key=lambda entry: entry[0].start_time)
+        first_start = past_menus[0][0].start_time - timedelta(days=1)
+
+        # Pre-existing codes could collide with random ones; they are few enough to load
+        taken = set(Order.objects.values_list("order_no", flat=True))
+        balances = {user.pk: user.balance for user in users}
+
+        # Chronological order per menu keeps remaining_balance consistent with the ledger
+        per_menu = [0] * len(past_menus)
+        for index in self.rng.choices(range(len(past_menus)), k=order_count):
+            per_menu[index] += 1
+
+        orders, order_items, ledger = [], [], []
+        for balance in balances.values():
+            balance.current_balance += deposit
+            ledger.append(
+                self._tx(balance, None, TransactionType.DEPOSIT, deposit, balance.current_balance, first_start)
+            )
+
+        written = 0
+        with _manual_timestamps(Order, OrderItem, Transaction):
+            for (menu, menu_items), count in zip(past_menus, per_menu, strict=True):
+                for user in self.rng.sample(users, k=min(count, len(users))):
+                    placed_at = menu.start_time - timedelta(hours=self.rng.randint(2, 72))
+                    served_at = menu.start_time + timedelta(minutes=self.rng.randint(0, 90))
+                    status = self.rng.choices(statuses, weights=weights)[0]
+
+                    order = Order(
+                        user=user,
+                        menu=menu,
+                        order_no=self._order_no(taken),
+                        status=OrderStatus.CANCELLED if status == "refunded" else status,
+                        total_amount=Decimal("0.00"),
+                        reservation_time=served_at,
+                        created_at=placed_at,
+                        updated_at=served_at,
+                    )
+                    for menu_item in self.rng.sample(menu_items, k=self.rng.randint(1, min(3, len(menu_items)))):
+                        quantity = self.rng.choice((1, 1, 1, 2))
+                        unit_price = menu_item.override_price or menu_item.item.base_price
+                        order.total_amount += unit_price * quantity
+                        order_items.append(
+                            OrderItem(
+                                order=order,
+                                menu_item=menu_item,
+                                quantity=quantity,
+                                unit_price=unit_price,
+                                total_price=unit_price * quantity,
+                                created_at=placed_at,
+                                updated_at=placed_at,
+                            )
+                        )
+                    orders.append(order)
+
+                    balance = balances[user.pk]
+                    if status == OrderStatus.CANCELLED:
+                        ledger.append(
+                            self._tx(
+                                balance,
+                                order,
+                                TransactionType.HOLD,
+                                order.total_amount,
+                                balance.current_balance,
+                                placed_at,
+                                TransactionStatus.CANCELLED,
+                            )
+                        )
+                        continue
+
+                    balance.current_balance -= order.total_amount
+                    ledger.append(
+                        self._tx(
+                            balance,
+                            order,
+                            TransactionType.PAYMENT,
+                            order.total_amount,
+                            balance.current_balance,
+                            served_at,
+                        )
+                    )
+                    if status == "refunded":
+                        balance.current_balance += order.total_amount
+                        ledger.append(
+                            self._tx(
+                                balance,
+                                order,
+                                TransactionType.REFUND,
+                                order.total_amount,
+                                balance.current_balance,
+                                served_at + timedelta(hours=1),
+                            )
+                        )
+
+                if len(order_items) + len(ledger) >= self.batch_size:
+                    written += self._flush(orders, order_items, ledger)
+                    self._log(f"Orders: {written}/{order_count}")
+
+            written += self._flush(orders, order_items, ledger)
+
+        Balance.objects.bulk_update(list(balances.values()), ["current_balance"], batch_size=self.batch_size)
+        self._log(f"Orders: {written}/{order_count}, balances updated")
+
+    def _flush(self, orders, order_items, ledger):
+        count = len(orders)
+        with transaction.atomic():
+            Order.objects.bulk_create(orders, batch_size=self.batch_size)
+            OrderItem.objects.bulk_create(order_items, batch_size=self.batch_size)
+            Transaction.objects.bulk_create(ledger, batch_size=self.batch_size)
+        orders.clear()
+        order_items.clear()
+        ledger.clear()
+        return count
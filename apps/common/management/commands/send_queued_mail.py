@@ -0,0 +1,85 @@
+import time
+
+import redis
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.mail_queue import claim_batch, deliver_batch, recover
+
+
+class Command(BaseCommand):
+    help = "Deliver emails queued by enqueue_mail over a persistent EMAIL_BACKEND connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--poll-timeout",
+            type=float,
+            default=2,
+            help="Seconds to block waiting for new mail, below REDIS_SOCKET_TIMEOUT",
+        )
+        parser.add_argument(
+            "--worker-id",
+            default="default",
+            help="Names this worker's processing list; unique per running worker and the same across its restarts",
+        )
+        parser.add_argument("--once", action="store_true", help="Drain the queue once and exit")
+
+    def handle(self, *args, **options):
+        # A blocking pop longer than the client's socket timeout fails with a timeout error instead of returning
+        if not 0 < options["poll_timeout"] < settings.REDIS_SOCKET_TIMEOUT:
+            raise CommandError(
+                f"--poll-timeout must be between 0 and REDIS_SOCKET_TIMEOUT ({settings.REDIS_SOCKET_TIMEOUT}s)"
+            )
+        batch_size = options["batch_size"]
+        worker_id = options["worker_id"]
+        poll_timeout = 0 if options["once"] else options["poll_timeout"]
+        connection = None
+        backoff = 1
+        recovered = None
+
+        try:
+            while True:
+                try:
+                    if recovered is None:
+                        recovered = recover(worker_id)
+                        if recovered:
+                            self.stdout.write(f"Re-queued {recovered} emails left unsent by a previous run")
+                    batch = claim_batch(worker_id, batch_size, timeout=poll_timeout)
+                except redis.RedisError as e:
+                    self.stderr.write(f"Redis unavailable: {e}")
+                    if options["once"]:
+                        return
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, 60)
+                    continue
+
+                if not batch:
+                    if options["once"]:
+                        return
+                    # Idle: release the SMTP connection instead of holding it open indefinitely
+                    if connection is not None:
+                        connection.close()
+                        connection = None
+                    continue
+
+                try:
+                    if connection is None:
+                        connection = get_connection()
+                        connection.open()
+                    sent = deliver_batch(worker_id, batch, connection)
+                    backoff = 1
+                    self.stdout.write(f"Sent {sent}/{len(batch)} queued emails")
+                except Exception as e:  # noqa: BLE001 - failed messages are already re-queued
+                    self.stderr.write(f"Mail delivery failed, retrying in {backoff}s: {e}")
+                    if connection is not None:
+                        connection.close()
+                        connection = None
+                    if options["once"]:
+                        return
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, 60)
+        finally:
+            if connection is not None:
+                connection.close()
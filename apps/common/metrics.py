@@ -0,0 +1,129 @@
+"""
+Per-request instrumentation (SQL, Redis and serializer time) and Prometheus metrics.
+
+Timings are collected into the ``RequestTimings`` bound to the current request by
+``apps.common.middleware.InstrumentationMiddleware``; serializer time is that of the blocks
+wrapped in ``time_serialization()`` (the JSON renderer, ``ValuesListMixin``). They are recorded
+in prometheus_client histograms, exposed at ``/metrics``. Under gunicorn the workers share them
+through prometheus_client's multiprocess mode, so any worker serves the totals of all of them.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_current_timings = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    __slots__ = ("sql_count", "sql_seconds", "redis_count", "redis_seconds", "serializer_seconds")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.redis_count = 0
+        self.redis_seconds = 0.0
+        self.serializer_seconds = 0.0
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - start
+            self.sql_count += 1
+
+    def record_redis(self, commands, seconds):
+        self.redis_count += commands
+        self.redis_seconds += seconds
+
+
+def bind_timings(timings):
+    return _current_timings.set(timings)
+
+
+def unbind_timings(token):
+    _current_timings.reset(token)
+
+
+def current_timings():
+    """The ``RequestTimings`` of the request being handled, or None outside instrumented requests."""
+    return _current_timings.get()
+
+
+REGISTRY = CollectorRegistry()
+
+REQUEST_LABELS = ("method", "route")
+
+
+def _histogram(name, documentation, buckets=DURATION_BUCKETS):
+    return Histogram(name, documentation, REQUEST_LABELS, buckets=buckets, registry=REGISTRY)
+
+
+requests_total = Counter("http_requests", "Requests handled.", (*REQUEST_LABELS, "status"), registry=REGISTRY)
+request_duration = _histogram("http_request_duration_seconds", "Total time spent in Django.")
+sql_duration = _histogram("http_request_sql_duration_seconds", "Time spent in SQL queries.")
+sql_queries = _histogram("http_request_sql_queries", "SQL queries per request.", COUNT_BUCKETS)
+redis_duration = _histogram("http_request_redis_duration_seconds", "Time spent in Redis commands.")
+redis_commands = _histogram("http_request_redis_commands", "Redis commands per request.", COUNT_BUCKETS)
+serializer_duration = _histogram(
+    "http_request_serializer_duration_seconds",
+    "Time spent rendering response data and building ValuesSerializer rows.",
+)
+
+
+def observe_request(method, route, status, total_seconds, timings):
+    labels = (method, route)
+    requests_total.labels(*labels, status).inc()
+    request_duration.labels(*labels).observe(total_seconds)
+    sql_duration.labels(*labels).observe(timings.sql_seconds)
+    sql_queries.labels(*labels).observe(timings.sql_count)
+    redis_duration.labels(*labels).observe(timings.redis_seconds)
+    redis_commands.labels(*labels).observe(timings.redis_count)
+    serializer_duration.labels(*labels).observe(timings.serializer_seconds)
+
+
+def render_metrics():
+    """
+    Prometheus text exposition. With ``PROMETHEUS_MULTIPROC_DIR`` set (config/gunicorn_conf.py) every
+    worker writes its samples there and this merges all of them, including those of exited workers;
+    otherwise it is this process' metrics only.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def server_timing(total_seconds, timings):
+    """``Server-Timing`` header value, durations in milliseconds."""
+    return ", ".join(
+        [
+            f'db;dur={timings.sql_seconds * 1e3:.2f};desc="{timings.sql_count} queries"',
+            f'redis;dur={timings.redis_seconds * 1e3:.2f};desc="{timings.redis_count} commands"',
+            f"serialize;dur={timings.serializer_seconds * 1e3:.2f}",
+            f"total;dur={total_seconds * 1e3:.2f}",
+        ]
+    )
+
+
+@contextmanager
+def time_serialization():
+    """Adds the block's duration to the current request's serializer time; a no-op outside instrumented requests."""
+    timings = current_timings()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.serializer_seconds += time.perf_counter() - start
@@ -0,0 +1,88 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.middleware.gzip import GZipMiddleware
+
+from apps.common import metrics
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryCountHeaderMiddleware:
+    """
+    Reports the number of SQL queries a request ran in the ``X-DB-Query-Count`` response
+    header. Enabled with ``QUERY_COUNT_HEADER`` (load tests, local profiling).
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_COUNT_HEADER:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = _QueryCounter()
+        with connections["default"].execute_wrapper(counter):
+            response = self.get_response(request)
+        response[QUERY_COUNT_HEADER] = str(counter.count)
+        return response
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Gzips responses of at least ``COMPRESSION_MIN_SIZE`` bytes for clients that accept it,
+    keeping GZipMiddleware's random padding against BREACH. Responses that already have a
+    ``Content-Encoding`` (cached payloads, see apps.common.conditional) are left as they are.
+    Enabled with ``RESPONSE_COMPRESSION``.
+    """
+
+    def __init__(self, get_response):
+        if not settings.RESPONSE_COMPRESSION:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        return super().process_response(request, response)
+
+
+class InstrumentationMiddleware:
+    """
+    Times each request and its SQL queries, Redis commands and serialization, reports the
+    breakdown in a ``Server-Timing`` header and records it in the ``/metrics`` histograms.
+    Enabled with ``REQUEST_METRICS``.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = metrics.RequestTimings()
+        token = metrics.bind_timings(timings)
+        start = time.perf_counter()
+        try:
+            with connections["default"].execute_wrapper(timings.sql_wrapper):
+                response = self.get_response(request)
+        finally:
+            metrics.unbind_timings(token)
+        total = time.perf_counter() - start
+
+        # The route pattern, not the path, keeps label cardinality bounded
+        match = request.resolver_match
+        route = f"/{match.route}" if match else "unmatched"
+        metrics.observe_request(request.method, route, response.status_code, total, timings)
+        response["Server-Timing"] = metrics.server_timing(total, timings)
+        return response
@@ -0,0 +1,177 @@
+"""
+Row counts for pagination that avoid a full ``COUNT(*)`` on large tables.
+
+On Postgres an unfiltered queryset is estimated from ``pg_class.reltuples`` and a
+filtered one from the planner's row estimate (``EXPLAIN``). Only when the estimate is
+above ``PAGINATION_COUNT_ESTIMATE_THRESHOLD`` is it used; smaller results (and other
+databases) get an exact count, so small lists stay exact.
+
+An estimate may be off in either direction, so it is only ever displayed: pages are not
+bounded by it, and whether another page exists is decided by fetching one extra row.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset: QuerySet) -> int | None:
+    """Planner estimate of ``queryset.count()``, or None if no estimate is available."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    query = queryset.query
+    if not query.where and not query.distinct and not query.combinator:
+        table = connection.ops.quote_name(queryset.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            row = cursor.fetchone()
+        # -1 means the table was never analyzed
+        return row[0] if row and row[0] >= 0 else None
+
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def fast_count(queryset: QuerySet, threshold: int | None = None) -> int:
+    """Exact count for small results, planner estimate above ``threshold``."""
+    if threshold is None:
+        threshold = settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+    estimate = estimate_count(queryset)
+    if estimate is None or estimate < threshold:
+        return queryset.count()
+    return estimate
+
+
+class EstimatedPage(Page):
+    """Page whose neighbours come from the rows actually fetched rather than the (estimated) count."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """Django paginator (admin changelists, ``EstimatedCountPagination``) using ``fast_count`` for querysets."""
+
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet):
+            return fast_count(self.object_list)
+        return super().count
+
+    def validate_number(self, number):
+        # No upper bound: the count may be an estimate, an empty page is rejected in page()
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"]) from None
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and (number > 1 or not self.allow_empty_first_page):
+            raise EmptyPage(self.error_messages["no_results"])
+        has_next = len(rows) > self.per_page
+        if not has_next:
+            # The last page gives the exact count for free (and spares small lists the count query)
+            self.__dict__.setdefault("count", bottom + len(rows))
+        return EstimatedPage(rows[: self.per_page], number, self, has_next=has_next)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    ``PageNumberPagination`` whose ``count`` comes from ``fast_count``; ``next`` is always
+    derived from fetching one extra row.
+
+    Clients that don't need a total can pass ``?count=false``: no count query runs at
+    all and ``count`` is null.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page = None
+        if request.query_params.get(self.count_query_param, "").lower() not in ("0", "false", "no"):
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        page_number = request.query_params.get(self.page_query_param, 1)
+        try:
+            self.page_number = int(page_number)
+            if self.page_number < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message="")) from None
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset : offset + page_size + 1])
+        self.has_next_page = len(rows) > page_size
+        self.request = request
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.page is not None:
+            return super().get_paginated_response(data)
+        return Response(
+            {"count": None, "next": self.get_next_link(), "previous": self.get_previous_link(), "results": data}
+        )
+
+    def get_next_link(self):
+        if self.page is not None:
+            return super().get_next_link()
+        if not self.has_next_page:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page is not None:
+            return super().get_previous_link()
+        if self.page_number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"]["nullable"] = True
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Pass false to skip counting (count is null, next is still set)",
+                "schema": {"type": "boolean"},
+            },
+        ]
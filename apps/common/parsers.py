@@ -0,0 +1,36 @@
+"""
+JSON request parsing with orjson.
+
+Same results as ``JSONParser``, except that integers beyond 64 bits come back as
+floats (which serializer fields then reject as invalid) instead of exact ints.
+"""
+
+import codecs
+
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+from rest_framework.utils import json
+
+from apps.common.renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = get_encoding(parser_context or {})
+        # orjson only reads UTF-8 and always rejects NaN/Infinity
+        if not self.strict or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+        # orjson is stricter in places (e.g. lone surrogate escapes): decide as JSONParser would
+        try:
+            return json.loads(body.decode(encoding))
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
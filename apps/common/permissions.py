@@ -1,7 +1,6 @@
+from django.apps import apps
 from django.contrib.auth.models import Group, Permission
-from django.db import connection
-from django.db.models.signals import post_migrate
-from django.dispatch import receiver
+from django.db import connection, transaction
 from rest_framework.permissions import BasePermission
 
 ROLE_PERMISSIONS = {
@@ -53,6 +52,9 @@ ROLE_PERMISSIONS = {
         ("wallets", "view_all_balances"),
         ("wallets", "view_all_transactions"),
         ("wallets", "refund_payment"),
+        # 4. Reports App - read-only rollups
+        ("reports", "view_dailysalessummary"),
+        ("reports", "view_dailycategorysales"),
     ],
     "customer_verified": [
         # The verified customer will have privileges regarding the following areas:
@@ -85,17 +87,27 @@ ROLE_PERMISSIONS = {
 }
 
 
-def _get_permission(app_label: str, codename: str):
-    try:
-        return Permission.objects.get(content_type__app_label=app_label, codename=codename)
-    except Permission.DoesNotExist:
-        print(f"WARNING: Permission {app_label}.{codename} does not exist!")
-        return None
+def _get_permission_ids() -> dict[tuple[str, str], int]:
+    """All permission ids keyed by (app_label, codename), resolved with a single query."""
+    return {
+        (app_label, codename): pk
+        for pk, app_label, codename in Permission.objects.values_list("pk", "content_type__app_label", "codename")
+    }
+
+
+def _get_or_create_groups(names) -> dict[str, int]:
+    group_ids = dict(Group.objects.filter(name__in=names).values_list("name", "pk"))
+    for name in names:
+        if name not in group_ids:
+            group_ids[name] = Group.objects.create(name=name).pk
+            print(f"Created group '{name}'")
+    return group_ids
 
 
-@receiver(post_migrate)
 def create_default_groups(sender, **kwargs):
-    if sender.name != "apps.common":
+    # post_migrate fires once per app; provision after the last one so every app's permissions exist
+    last_app = [app_config for app_config in apps.get_app_configs() if app_config.models_module][-1]
+    if sender.label != last_app.label:
         return
 
     table_names = connection.introspection.table_names()
@@ -105,22 +117,44 @@ def create_default_groups(sender, **kwargs):
         print("Skipping group creation - required tables not yet created")
         return
 
-    for role, perm_list in ROLE_PERMISSIONS.items():
-        group, created = Group.objects.get_or_create(name=role)
-
-        if role == "admin":
-            all_perms = Permission.objects.all()
-            group.permissions.set(all_perms)
-        else:
-            perms = list(filter(None, (_get_permission(app, code) for app, code in perm_list)))
-            if not perms:
-                print(f"WARNING: No permissions found for role '{role}'!")
-            group.permissions.set(perms)
-
-        if created:
-            print(f"Created group '{role}' with permissions")
-        else:
-            print(f"Updated group '{role}' with permissions")
+    with transaction.atomic():
+        perm_ids = _get_permission_ids()
+        group_ids = _get_or_create_groups(list(ROLE_PERMISSIONS))
+
+        through = Group.permissions.through
+        current = {group_id: set() for group_id in group_ids.values()}
+        for group_id, permission_id in through.objects.filter(group_id__in=current).values_list(
+            "group_id", "permission_id"
+        ):
+            current[group_id].add(permission_id)
+
+        for role, perm_list in ROLE_PERMISSIONS.items():
+            group_id = group_ids[role]
+
+            if role == "admin":
+                wanted = set(perm_ids.values())
+            else:
+                wanted = set()
+                for app, code in perm_list:
+                    if (app, code) in perm_ids:
+                        wanted.add(perm_ids[(app, code)])
+                    else:
+                        print(f"WARNING: Permission {app}.{code} does not exist!")
+                if not wanted:
+                    print(f"WARNING: No permissions found for role '{role}'!")
+
+            to_add = wanted - current[group_id]
+            to_remove = current[group_id] - wanted
+
+            if to_remove:
+                through.objects.filter(group_id=group_id, permission_id__in=to_remove).delete()
+            if to_add:
+                through.objects.bulk_create(
+                    [through(group_id=group_id, permission_id=permission_id) for permission_id in to_add]
+                )
+
+            if to_add or to_remove:
+                print(f"Updated group '{role}' permissions (+{len(to_add)} / -{len(to_remove)})")
 
 
 class IsOwnerOrAdmin(BasePermission):
@@ -0,0 +1,213 @@
+"""
+In-memory RBAC engine.
+
+``ROLE_PERMISSIONS`` is static, so it is compiled once at import time into a frozen
+role-group -> permission matrix. What varies per user is kept in Redis (``get_user_grants``):
+the names of the groups the user is in, and the permissions granted outside the matrix
+(direct user permissions, groups assigned by hand in the admin). Membership and grant
+changes delete the entry, so permission checks answer from memory plus at most one
+Redis read per request, with the same result as Django's ``ModelBackend``.
+"""
+
+import json
+import logging
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+from typing import NamedTuple
+
+import redis
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.db.models import Q
+
+from .constants import ROLE_GROUP_NAMES
+from .permissions import ROLE_PERMISSIONS
+from .redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+redis_client = get_redis_client("cache")
+
+GRANTS_KEY_PREFIX = "rbac:grants:"
+
+# Role groups that are granted every permission (see ROLE_PERMISSIONS["admin"])
+UNRESTRICTED_GROUPS = frozenset({"admin"})
+
+
+def compile_role_permissions(role_permissions: Mapping[str, Iterable[tuple[str, str]]]) -> Mapping[str, frozenset]:
+    """Compile ``{role: [(app_label, codename), ...]}`` into ``{role: frozenset({"app_label.codename"})}``."""
+    return MappingProxyType(
+        {
+            role: frozenset(f"{app_label}.{codename}" for app_label, codename in perms)
+            for role, perms in role_permissions.items()
+        }
+    )
+
+
+ROLE_PERMISSION_MATRIX = compile_role_permissions(ROLE_PERMISSIONS)
+
+
+def role_has_perm(group_name: str | None, perm: str) -> bool:
+    if group_name in UNRESTRICTED_GROUPS:
+        return True
+    return perm in ROLE_PERMISSION_MATRIX.get(group_name, ())
+
+
+class UserGrants(NamedTuple):
+    groups: frozenset
+    # "app_label.codename" granted directly or through groups outside ROLE_GROUP_NAMES
+    permissions: frozenset
+
+
+NO_GRANTS = UserGrants(frozenset(), frozenset())
+
+
+def _load_user_grants(user) -> UserGrants:
+    groups = frozenset(user.groups.values_list("name", flat=True))
+    # Role groups are answered by the matrix; only look up the other grants
+    extra_groups = Group.objects.filter(user=user).exclude(name__in=ROLE_GROUP_NAMES)
+    permissions = (
+        Permission.objects.filter(Q(user=user) | Q(group__in=extra_groups))
+        .values_list("content_type__app_label", "codename")
+        .distinct()
+    )
+    return UserGrants(groups, frozenset(f"{app_label}.{codename}" for app_label, codename in permissions))
+
+
+def get_user_grants(user) -> UserGrants:
+    """The user's group names and extra permissions: from the instance, else Redis, else the DB."""
+    grants = user.__dict__.get("_rbac_grants")
+    if grants is not None:
+        return grants
+    if not getattr(user, "is_authenticated", False) or user.pk is None:
+        return NO_GRANTS
+
+    key = f"{GRANTS_KEY_PREFIX}{user.pk}"
+    try:
+        cached = redis_client.get(key)
+    except redis.RedisError as e:
+        logger.warning(f"RBAC grants cache unavailable: {e}")
+        cached = None
+
+    if cached is not None:
+        data = json.loads(cached)
+        grants = UserGrants(frozenset(data["groups"]), frozenset(data["permissions"]))
+    else:
+        grants = _load_user_grants(user)
+        data = {"groups": sorted(grants.groups), "permissions": sorted(grants.permissions)}
+        try:
+            redis_client.set(key, json.dumps(data), ex=settings.RBAC_GRANTS_TTL)
+        except redis.RedisError as e:
+            logger.warning(f"Could not cache RBAC grants: {e}")
+
+    user._rbac_grants = grants
+    return grants
+
+
+def invalidate_user_grants(user_ids):
+    """Drop the cached grants of these users once the current transaction commits."""
+    keys = [f"{GRANTS_KEY_PREFIX}{pk}" for pk in user_ids]
+    if not keys:
+        return
+
+    def delete():
+        try:
+            redis_client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"Could not invalidate RBAC grants of {len(keys)} user(s): {e}")
+
+    transaction.on_commit(delete)
+
+
+def has_role_permission(user, perm: str) -> bool:
+    """
+    Check ``perm`` ("app_label.codename") for ``user``, like ``user.has_perm``: role groups
+    the user is a member of are answered by the matrix, anything else by the cached grants.
+    No DB query unless the grants are not cached yet.
+    """
+    if not getattr(user, "is_authenticated", False) or not getattr(user, "is_active", False):
+        return False
+
+    if getattr(user, "is_superuser", False):
+        return True
+
+    grants = get_user_grants(user)
+    if any(role_has_perm(name, perm) for name in grants.groups):
+        return True
+
+    return perm in grants.permissions
+
+
+ROLE_GROUPS_KEY = "rbac:role_groups"
+
+
+def get_role_group_ids(refresh: bool = False) -> dict[str, int]:
+    """
+    Role group name -> Group id. Cached in Redis, shared by every process, once every role
+    group exists; Group saves and deletes drop it. ``refresh`` reads the database regardless.
+    """
+    if not refresh:
+        try:
+            cached = redis_client.get(ROLE_GROUPS_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Role group ids unavailable: {e}")
+            cached = None
+        if cached is not None:
+            return json.loads(cached)
+
+    group_ids = dict(Group.objects.filter(name__in=ROLE_GROUP_NAMES).values_list("name", "pk"))
+    if len(group_ids) == len(ROLE_GROUP_NAMES):
+        try:
+            redis_client.set(ROLE_GROUPS_KEY, json.dumps(group_ids))
+        except redis.RedisError as e:
+            logger.warning(f"Could not cache role group ids: {e}")
+    return group_ids
+
+
+def clear_role_group_ids(**kwargs):
+    """Group saved (possibly renamed) or deleted: drop the cached role group ids once committed."""
+
+    def delete():
+        try:
+            redis_client.delete(ROLE_GROUPS_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Could not clear role group ids: {e}")
+
+    transaction.on_commit(delete)
+
+
+def _group_member_ids(group_ids):
+    through = get_user_model().groups.through
+    return list(through.objects.filter(group_id__in=group_ids).values_list("user_id", flat=True))
+
+
+def invalidate_membership_grants(sender, instance, action, reverse, pk_set, **kwargs):
+    """m2m_changed on ``User.groups`` / ``User.user_permissions``: the affected users' grants are stale."""
+    if action in ("post_add", "post_remove"):
+        invalidate_user_grants(pk_set if reverse else [instance.pk])
+    elif action == "pre_clear":
+        # pk_set is not given for clear(): read who is affected before the rows go
+        invalidate_user_grants(list(instance.user_set.values_list("pk", flat=True)) if reverse else [instance.pk])
+
+
+def invalidate_group_permission_grants(sender, instance, action, reverse, pk_set, **kwargs):
+    """m2m_changed on ``Group.permissions``: members of the changed groups. Role groups go by the matrix."""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        group_ids = [] if instance.name in ROLE_GROUP_NAMES else [instance.pk]
+    elif action == "pre_clear":
+        group_ids = list(instance.group_set.exclude(name__in=ROLE_GROUP_NAMES).values_list("pk", flat=True))
+    else:
+        group_ids = list(
+            Group.objects.filter(pk__in=pk_set).exclude(name__in=ROLE_GROUP_NAMES).values_list("pk", flat=True)
+        )
+    invalidate_user_grants(_group_member_ids(group_ids))
+
+
+def invalidate_group_grants(sender, instance, **kwargs):
+    """Group renamed (post_save) or about to be deleted with its memberships (pre_delete)."""
+    if instance.pk is not None:
+        invalidate_user_grants(_group_member_ids([instance.pk]))
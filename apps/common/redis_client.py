@@ -1,20 +1,165 @@
+"""
+Redis clients.
+
+Each logical client (``REDIS_DATABASES``: sessions, cache, ratelimit, queue) has its own
+bounded ``BlockingConnectionPool`` per process, so a burst on one concern (e.g. rate limit
+checks) waits briefly for a connection instead of opening unbounded sockets or starving
+the others. With ``REDIS_SENTINELS`` set, clients connect to the current master instead.
+Clients decode replies to ``str``; a ``binary`` client of the same database returns ``bytes``.
+"""
+
+import asyncio
+import time
+import weakref
+
 import redis
 from django.conf import settings
+from redis.sentinel import Sentinel
+
+from apps.common.metrics import current_timings
+
+
+class _InstrumentedPipeline(redis.client.Pipeline):
+    def execute(self, raise_on_error=True):
+        timings = current_timings()
+        if timings is None:
+            return super().execute(raise_on_error)
+        commands = len(self.command_stack)
+        start = time.perf_counter()
+        try:
+            return super().execute(raise_on_error)
+        finally:
+            timings.record_redis(commands, time.perf_counter() - start)
+
+
+class InstrumentedRedis(redis.StrictRedis):
+    """Reports command counts and time to the current request's timings (see apps.common.metrics)."""
+
+    def execute_command(self, *args, **options):
+        timings = current_timings()
+        if timings is None:
+            return super().execute_command(*args, **options)
+        start = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            timings.record_redis(1, time.perf_counter() - start)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return _InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+def _connection_kwargs(name, binary=False):
+    if name not in settings.REDIS_DATABASES:
+        raise KeyError(f"Unknown Redis client {name!r}, expected one of {sorted(settings.REDIS_DATABASES)}")
+    return {
+        "db": settings.REDIS_DATABASES[name],
+        "password": settings.REDIS_PASSWORD or None,
+        "decode_responses": not binary,
+        "socket_connect_timeout": settings.REDIS_CONNECT_TIMEOUT,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "retry_on_timeout": True,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+        "client_name": f"canteen:{name}:binary" if binary else f"canteen:{name}",
+    }
+
+
+def _sentinel_addresses():
+    return [(host, int(port)) for host, _, port in (address.rpartition(":") for address in settings.REDIS_SENTINELS)]
+
+
+_clients = {}
+
+
+def get_redis_client(name, binary=False):
+    """The process-wide client for a logical Redis database, created on first use."""
+    key = f"{name}:binary" if binary else name
+    client = _clients.get(key)
+    if client is None:
+        kwargs = _connection_kwargs(name, binary)
+        if settings.REDIS_SENTINELS:
+            # Sentinel pools are not blocking; max_connections still bounds them (errors when exhausted)
+            sentinel = Sentinel(
+                _sentinel_addresses(), sentinel_kwargs={"socket_timeout": settings.REDIS_CONNECT_TIMEOUT}
+            )
+            client = sentinel.master_for(
+                settings.REDIS_SENTINEL_MASTER,
+                redis_class=InstrumentedRedis,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                **kwargs,
+            )
+        else:
+            pool = redis.BlockingConnectionPool(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                **kwargs,
+            )
+            client = InstrumentedRedis(connection_pool=pool)
+        client = _clients.setdefault(key, client)
+    return client
+
+
+# Async pools are bound to the event loop they were created on
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_redis_client(name):
+    """Client for ``redis.asyncio`` (async views / ASGI), one per event loop and logical database."""
+    import redis.asyncio
+
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(name)
+    if client is None:
+        kwargs = _connection_kwargs(name)
+        kwargs.pop("health_check_interval")
+        if settings.REDIS_SENTINELS:
+            sentinel = redis.asyncio.Sentinel(
+                _sentinel_addresses(), sentinel_kwargs={"socket_timeout": settings.REDIS_CONNECT_TIMEOUT}
+            )
+            client = sentinel.master_for(
+                settings.REDIS_SENTINEL_MASTER, max_connections=settings.REDIS_MAX_CONNECTIONS, **kwargs
+            )
+        else:
+            pool = redis.asyncio.BlockingConnectionPool(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                **kwargs,
+            )
+            client = redis.asyncio.Redis(connection_pool=pool)
+        clients[name] = client
+    return client
+
+
+def pool_stats(client):
+    """Connections of a client's pool: opened so far, currently checked out, and the limit."""
+    pool = client.connection_pool
+    if isinstance(pool, redis.BlockingConnectionPool):
+        opened = sum(1 for connection in pool._connections if connection is not None)
+        idle = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+        in_use = opened - idle
+    else:
+        opened = pool._created_connections
+        in_use = len(pool._in_use_connections)
+    return {"max": pool.max_connections, "opened": opened, "in_use": in_use}
+
+
+def redis_health():
+    """Ping every logical client and report its pool usage."""
+    report = {}
+    for name in settings.REDIS_DATABASES:
+        client = get_redis_client(name)
+        try:
+            client.ping()
+            ok = True
+        except redis.RedisError:
+            ok = False
+        report[name] = {"ok": ok, "db": settings.REDIS_DATABASES[name], **pool_stats(client)}
+    return report
+
 
-redis_client = redis.StrictRedis(
-    host=settings.REDIS_HOST,
-    port=settings.REDIS_PORT,
-    db=0,
-    decode_responses=True,
-    socket_connect_timeout=5,
-    socket_timeout=5,
-    retry_on_timeout=True,
-)
-
-
-def test_redis_connection():
-    try:
-        redis_client.ping()
-        return True
-    except redis.ConnectionError:
-        return False
+redis_client = get_redis_client("sessions")
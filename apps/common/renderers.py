@@ -0,0 +1,47 @@
+"""
+JSON rendering with orjson.
+
+Produces the same bytes as DRF's ``JSONRenderer`` for compact UTF-8 output (the
+project's settings): types orjson does not handle the same way (Decimal, datetime,
+lazy strings, ...) go through DRF's own encoder via ``default``. Anything else the
+stock renderer does differently (``?indent=``, ASCII output, ints beyond 64 bits) is
+left to it.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.common.metrics import time_serialization
+
+# Datetimes would get "+00:00" instead of DRF's "Z"
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with time_serialization():
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if data is None:
+            return b""
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            # Let the stock renderer serialize it or raise its usual error
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, keeping the output a strict JavaScript subset
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -1,14 +1,13 @@
+from .rbac import get_user_grants
+
+
 def is_authenticated(user) -> bool:
     return getattr(user, "is_authenticated", False)
 
 
-def get_user_groups_set(user) -> set:
-    if hasattr(user, "_group_names_cache"):
-        return user._group_names_cache
-
-    names = set(user.groups.values_list("name", flat=True))
-    user._group_names_cache = names
-    return names
+def get_user_groups_set(user) -> frozenset:
+    # Cached per user in Redis, see apps.common.rbac
+    return get_user_grants(user).groups
 
 
 def is_in_group(user, group_name: str) -> bool:
@@ -0,0 +1,245 @@
+"""
+Read-only serialization from ``.values()`` rows for hot list endpoints.
+
+A ``ValuesSerializer`` reproduces the output of a DRF ``serializer_class`` without
+building model instances or running DRF's per-field machinery. The declared fields are
+resolved once per class into one getter per output key: an ``itemgetter`` for values
+DRF outputs unchanged, and the same conversion DRF applies (decimal quantizing, datetime
+timezone and format, UUID strings) with its settings resolved up front. The JSON stays
+identical and the declared serializer keeps documenting the endpoint in the OpenAPI
+schema. Method fields are implemented as ``get_<name>(row)``; nested lists cost one
+``values()`` query per level.
+"""
+
+import decimal
+from operator import itemgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import empty
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from apps.common.metrics import time_serialization
+
+# Fields that represent database values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+# Fields whose representation depends on the field (format, quantize, timezone)
+CONVERTED_FIELDS = (
+    serializers.DateField,
+    serializers.DateTimeField,
+    serializers.DecimalField,
+    serializers.UUIDField,
+)
+
+# strftime() equivalent of isoformat(timespec="seconds") without the offset, for years >= 1000
+SECONDS_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+_SKIP = object()
+
+
+def _converter(field):
+    """A faster equivalent of ``field.to_representation`` for non-null database values."""
+    if isinstance(field, serializers.DecimalField):
+        if (
+            getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+            and field.decimal_places is not None
+            and not field.localize
+            and not getattr(field, "normalize_output", False)
+        ):
+            # DecimalField.quantize, with its context built once instead of per value
+            context = decimal.getcontext().copy()
+            if field.max_digits is not None:
+                context.prec = field.max_digits
+            exponent = decimal.Decimal(".1") ** field.decimal_places
+            rounding = field.rounding
+            return lambda value: f"{value.quantize(exponent, rounding=rounding, context=context):f}"
+    elif isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        if isinstance(output_format, str) and output_format.lower() != ISO_8601 and field_timezone is not None:
+            # Aware values (USE_TZ) only; anything else takes DRF's path
+            if output_format.startswith(SECONDS_FORMAT) and "%" not in output_format[len(SECONDS_FORMAT) :]:
+                # Common case, e.g. "%Y-%m-%dT%H:%M:%SZ": slicing isoformat() beats strftime()
+                suffix = output_format[len(SECONDS_FORMAT) :]
+                return lambda value: (
+                    value.astimezone(field_timezone).isoformat(timespec="seconds")[:19] + suffix
+                    if value.tzinfo is not None and value.year >= 1000
+                    else field.to_representation(value)
+                )
+            return lambda value: (
+                value.astimezone(field_timezone).strftime(output_format)
+                if value.tzinfo is not None
+                else field.to_representation(value)
+            )
+    elif isinstance(field, serializers.UUIDField) and field.uuid_format == "hex_verbose":
+        return str
+    return field.to_representation
+
+
+def _missing(field):
+    """What DRF outputs when a dotted source crosses a null relation (see Field.get_attribute)."""
+    if field.default is not empty:
+        return lambda: field.get_default()
+    if field.allow_null:
+        return lambda: None
+    if not field.required:
+        return lambda: _SKIP
+
+    def fail():
+        raise AttributeError(f"{field.field_name!r}: {field.source!r} crosses a null relation")
+
+    return fail
+
+
+def _getter(kind, field, lookup, relations):
+    """Function returning one output value from a row."""
+    if kind == "convert":
+        convert = _converter(field)
+
+        def get(row):
+            value = row[lookup]
+            return None if value is None else convert(value)
+
+    else:
+        get = itemgetter(lookup)
+    if not relations:
+        return get
+    missing = _missing(field)
+
+    def get_or_missing(row):
+        for relation in relations:
+            if row[relation] is None:
+                return missing()
+        return get(row)
+
+    return get_or_missing
+
+
+class ValuesSerializer:
+    serializer_class = None
+    # Output field -> (ValuesSerializer class, lookup of the parent's pk on the child model)
+    nested = {}
+    # Extra values() lookups the get_<name> methods read
+    extra_lookups = ()
+
+    _layouts = {}
+
+    def __init__(self):
+        layout = self._layout()
+        self.pk = layout["pk"]
+        self.lookups = layout["lookups"]
+        self.skippable = layout["skippable"]
+        self.nested_serializers = {
+            name: (serializer_class(), parent_lookup) for name, (serializer_class, parent_lookup) in self.nested.items()
+        }
+        # Filled per serialize() call: nested lists depend on the rows
+        self.nested_readers = {}
+
+        self.getters = []
+        for name, kind, field, lookup, relations in layout["fields"]:
+            if kind == "nested":
+                getter = self._nested_getter(name)
+            elif kind == "call":
+                getter = getattr(self, f"get_{name}")
+            else:
+                getter = _getter(kind, field, lookup, relations)
+            self.getters.append((name, getter))
+
+    @classmethod
+    def _layout(cls):
+        """
+        The serializer's fields resolved to lookups and conversions, once per class:
+        building a ModelSerializer's fields is slow, and so is the generic per-field loop.
+        """
+        if cls not in cls._layouts:
+            fields, skippable = [], []
+            # Keyed by the pk's name rather than "pk", so an "id" field doesn't select it twice
+            pk = cls.serializer_class.Meta.model._meta.pk.name
+            lookups = dict.fromkeys([pk, *cls.extra_lookups])
+            for name, field in cls.serializer_class().fields.items():
+                if field.write_only:
+                    continue
+                if name in cls.nested or isinstance(field, serializers.SerializerMethodField):
+                    fields.append((name, "nested" if name in cls.nested else "call", None, None, ()))
+                    continue
+                if isinstance(field, CONVERTED_FIELDS):
+                    kind = "convert"
+                elif isinstance(field, PASSTHROUGH_FIELDS):
+                    kind = "value"
+                else:
+                    raise ImproperlyConfigured(f"{cls.__name__} cannot read {type(field).__name__} {name!r}")
+
+                path = field.source_attrs
+                lookup = "__".join(path)
+                # Foreign keys along a dotted source, to tell a null relation from a null value
+                relations = tuple("__".join(path[:depth]) for depth in range(1, len(path)))
+                lookups.update(dict.fromkeys([*relations, lookup]))
+                fields.append((name, kind, field, lookup, relations))
+                if relations and field.default is empty and not field.allow_null and not field.required:
+                    skippable.append(name)
+
+            cls._layouts[cls] = {"fields": fields, "pk": pk, "lookups": list(lookups), "skippable": skippable}
+        return cls._layouts[cls]
+
+    def values(self, queryset, *lookups):
+        """The queryset as rows carrying every lookup the output needs."""
+        return queryset.select_related(None).prefetch_related(None).values(*lookups, *self.lookups)
+
+    def prefetch(self, rows):
+        """Hook to load whatever the get_<name> methods need for these rows, in bulk."""
+
+    def serialize(self, rows):
+        rows = list(rows)
+        if not rows:
+            return []
+        self.prefetch(rows)
+        for name, (serializer, parent_lookup) in self.nested_serializers.items():
+            self.nested_readers[name] = self._nested_reader(serializer, parent_lookup, [row[self.pk] for row in rows])
+
+        getters = self.getters
+        data = [{name: get(row) for name, get in getters} for row in rows]
+        for name in self.skippable:
+            for item in data:
+                if item[name] is _SKIP:
+                    del item[name]
+        return data
+
+    def _nested_getter(self, name):
+        readers = self.nested_readers
+        return lambda row: readers[name](row)
+
+    def _nested_reader(self, serializer, parent_lookup, parent_pks):
+        model = serializer.serializer_class.Meta.model
+        queryset = model.objects.filter(**{f"{parent_lookup}__in": parent_pks})
+        child_rows = list(serializer.values(queryset, parent_lookup))
+        groups = {}
+        for child_row, item in zip(child_rows, serializer.serialize(child_rows), strict=True):
+            groups.setdefault(child_row[parent_lookup], []).append(item)
+        pk = self.pk
+        return lambda row: groups.get(row[pk], [])
+
+
+class ValuesListMixin:
+    """
+    Serves a list view's GET with ``values_serializer_class``. ``serializer_class``
+    still describes the response for the schema.
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.values_serializer_class()
+        queryset = serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        with time_serialization():
+            data = serializer.serialize(queryset if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
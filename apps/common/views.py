@@ -1 +1,35 @@
-# Create your views here.
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from apps.common.metrics import render_metrics
+from apps.common.redis_client import redis_health
+
+
+def metrics_view(request):
+    """Prometheus text exposition of the request metrics (of all workers under gunicorn)."""
+    if not settings.REQUEST_METRICS:
+        raise Http404
+    if settings.METRICS_TOKEN and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
+
+
+def health_view(request):
+    """Readiness: database and every Redis client reachable (503 otherwise), with Redis pool usage."""
+    try:
+        connection.ensure_connection()
+        database_ok = True
+    except DatabaseError:
+        database_ok = False
+
+    redis = redis_health()
+    ok = database_ok and all(client["ok"] for client in redis.values())
+    return JsonResponse(
+        {"status": "ok" if ok else "unavailable", "database": {"ok": database_ok}, "redis": redis},
+        status=200 if ok else 503,
+    )
@@ -17,6 +17,9 @@ class MenuItemInline(TabularInline):
     autocomplete_fields = ["item"]
     exclude = ("deleted_at",)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("item")
+
 
 @admin.register(Category)
 class CategoryAdmin(ModelAdmin):
@@ -28,6 +31,7 @@ class CategoryAdmin(ModelAdmin):
 @admin.register(Item)
 class ItemAdmin(ModelAdmin):
     list_display = ("name", "category", "base_price")
+    list_select_related = ("category",)
     list_filter = ("category",)
     search_fields = ("name",)
     exclude = ("deleted_at",)
@@ -44,6 +48,7 @@ class MenuAdmin(ModelAdmin):
 @admin.register(MenuItem)
 class MenuItemAdmin(ModelAdmin):
     list_display = ("menu", "item", "display_order")
+    list_select_related = ("menu", "item")
     list_filter = ("menu", "item")
     search_fields = ("item__name", "menu__name")
     exclude = ("deleted_at",)
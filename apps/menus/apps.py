@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MenusConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.menus"
+
+    def ready(self):
+        import apps.menus.signals  # noqa
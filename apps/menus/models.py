@@ -2,6 +2,7 @@ from decimal import Decimal
 
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 from apps.common.constants import MenuType
 from apps.common.models import BaseModel
@@ -71,6 +72,13 @@ class Menu(BaseModel):
     def __str__(self):
         return f"{self.name} ({self.start_time} - {self.end_time})"
 
+    @classmethod
+    def next_time(cls, field):
+        """The earliest upcoming ``start_time``/``end_time`` of any menu (when time-based listings change)."""
+        return (
+            cls.objects.filter(**{f"{field}__gt": timezone.now()}).order_by(field).values_list(field, flat=True).first()
+        )
+
 
 class MenuItem(BaseModel):
     menu = models.ForeignKey(
@@ -8,7 +8,8 @@ from rest_framework.response import Response
 class WeeklyMenuPagination(BasePagination):
     def paginate_queryset(self, queryset, request, view=None):
         self.week_offset = int(request.query_params.get("week_offset", 0))
-        today = timezone.now().date()
+        # Local, like the start_time__date lookups below and the ETag of the views it pages
+        today = timezone.localdate()
         start_of_week = today - timedelta(days=today.weekday())
         start_of_week += timedelta(weeks=self.week_offset)
         end_of_week = start_of_week + timedelta(days=6)
@@ -1,7 +1,13 @@
 from django.db.models import Sum
 from rest_framework import serializers
 
+from apps.common.constants import OrderStatus
+from apps.common.values_serializers import ValuesSerializer
 from apps.menus.models import Menu, MenuItem
+from apps.orders.models import OrderItem
+
+# Orders whose items count against a menu item's displayed remaining quantity
+RESERVED_ORDER_STATUSES = [OrderStatus.PENDING, OrderStatus.CONFIRMED]
 
 
 class MenuItemSerializer(serializers.ModelSerializer):
@@ -24,8 +30,13 @@ class MenuItemSerializer(serializers.ModelSerializer):
         ]
 
     def get_remaining_quantity(self, obj):
+        # Callers that prefetch the reserved order items (to_attr) avoid a query per menu item; MenusView itself
+        # serves MenuValuesSerializer, which sums them in one query
+        if hasattr(obj, "reserved_order_items"):
+            return obj.quantity - sum(order_item.quantity for order_item in obj.reserved_order_items)
+
         ordered_quantity = (
-            obj.order_items.filter(order__status__in=["pending", "confirmed"]).aggregate(total=Sum("quantity"))["total"]
+            obj.order_items.filter(order__status__in=RESERVED_ORDER_STATUSES).aggregate(total=Sum("quantity"))["total"]
             or 0
         )
 
@@ -38,3 +49,26 @@ class MenuSerializer(serializers.ModelSerializer):
     class Meta:
         model = Menu
         fields = ["id", "name", "start_time", "end_time", "menu_items", "type"]
+
+
+class MenuItemValuesSerializer(ValuesSerializer):
+    serializer_class = MenuItemSerializer
+
+    def prefetch(self, rows):
+        reserved = (
+            OrderItem.objects.filter(
+                menu_item__in=[row["id"] for row in rows], order__status__in=RESERVED_ORDER_STATUSES
+            )
+            .values("menu_item")
+            .annotate(total=Sum("quantity"))
+            .order_by()
+        )
+        self.reserved = {row["menu_item"]: row["total"] for row in reserved}
+
+    def get_remaining_quantity(self, row):
+        return row["quantity"] - self.reserved.get(row["id"], 0)
+
+
+class MenuValuesSerializer(ValuesSerializer):
+    serializer_class = MenuSerializer
+    nested = {"menu_items": (MenuItemValuesSerializer, "menu")}
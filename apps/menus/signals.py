@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.conditional import bump_etag_scopes
+from apps.menus.models import Category, Item, Menu, MenuItem
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Item)
+@receiver([post_save, post_delete], sender=MenuItem)
+def bump_catalogue_etags(sender, **kwargs):
+    bump_etag_scopes("catalogue")
+
+
+@receiver([post_save, post_delete], sender=Menu)
+def bump_menu_etags(sender, **kwargs):
+    # A changed start/end time also moves when listings change on their own
+    bump_etag_scopes("catalogue", "menu-starts", "menu-ends")
@@ -1,15 +1,14 @@
-from django.db.models import Prefetch
 from django.utils import timezone
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.common.constants import OrderStatus
-from apps.menus.models import Menu, MenuItem
+from apps.common.conditional import ConditionalGetMixin
+from apps.common.values_serializers import ValuesListMixin
+from apps.menus.models import Menu
 from apps.menus.paginators import WeeklyMenuPagination
-from apps.menus.serializers import MenuSerializer
-from apps.orders.models import OrderItem
+from apps.menus.serializers import MenuSerializer, MenuValuesSerializer
 
 
 # --- Items ---
@@ -67,23 +66,23 @@ class CategoryDetailView(APIView):
         ),
     ],
 )
-class MenusView(generics.ListAPIView):
+class MenusView(ConditionalGetMixin, ValuesListMixin, generics.ListAPIView):
     serializer_class = MenuSerializer
+    values_serializer_class = MenuValuesSerializer
     pagination_class = WeeklyMenuPagination
+    # Same week of menus for everyone
+    cache_payload = True
+
+    def get_etag_scopes(self):
+        return {
+            "catalogue": None,
+            "reservations": None,
+            # Menus leave the listing once they start
+            "menu-starts": lambda: Menu.next_time("start_time"),
+        }
 
     def get_queryset(self):
-        return Menu.objects.prefetch_related(
-            Prefetch(
-                "menu_items",
-                queryset=MenuItem.objects.select_related("item").prefetch_related(
-                    Prefetch(
-                        "order_items",
-                        queryset=OrderItem.objects.filter(order__status__in=OrderStatus.active()),
-                        to_attr="filtered_order_items",
-                    )
-                ),
-            )
-        ).filter(start_time__gte=timezone.now())
+        return Menu.objects.filter(start_time__gte=timezone.now())
 
     # def post(self, request):
     #     return Response(status=status.HTTP_501_NOT_IMPLEMENTED)
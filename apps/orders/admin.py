@@ -1,6 +1,7 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin, TabularInline
 
+from apps.common.pagination import EstimatedCountPaginator
 from apps.orders.models import Order, OrderItem
 
 
@@ -11,6 +12,10 @@ class OrderItemInline(TabularInline):
     exclude = ("deleted_at",)
     can_delete = False
 
+    def get_queryset(self, request):
+        # menu_item is rendered via MenuItem.__str__ (menu + item)
+        return super().get_queryset(request).select_related("menu_item__menu", "menu_item__item")
+
     def has_add_permission(self, request, obj):
         return False
 
@@ -24,6 +29,9 @@ class OrderAdmin(ModelAdmin):
     exclude = ("deleted_at",)
     inlines = [OrderItemInline]
     autocomplete_fields = ["user", "menu"]
+    list_select_related = ("user", "menu")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def get_readonly_fields(self, request, obj=None):
         readonly = list(self.readonly_fields)
@@ -43,6 +51,9 @@ class OrderItemAdmin(ModelAdmin):
     readonly_fields = ("created_at", "updated_at")
     exclude = ("deleted_at",)
     autocomplete_fields = ["order", "menu_item"]
+    list_select_related = ("order", "menu_item__item")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def order_no(self, obj):
         return obj.order.order_no
@@ -8,6 +8,7 @@ from django.utils import timezone
 from rest_framework import serializers
 
 from apps.common.constants import OrderStatus
+from apps.common.values_serializers import ValuesSerializer
 from apps.menus.models import Menu, MenuItem
 from apps.orders.models import Order, OrderItem
 from apps.wallets.services import WalletError, cancel_order_with_hold_release, place_hold
@@ -209,3 +210,19 @@ class OrderListSerializer(serializers.ModelSerializer):
 
     def get_is_active(self, obj):
         return obj.menu.end_time > timezone.now()
+
+
+class OrderItemListValuesSerializer(ValuesSerializer):
+    serializer_class = OrderItemListSerializer
+
+
+class OrderListValuesSerializer(ValuesSerializer):
+    serializer_class = OrderListSerializer
+    nested = {"items": (OrderItemListValuesSerializer, "order")}
+    extra_lookups = ("menu__end_time",)
+
+    def prefetch(self, rows):
+        self.now = timezone.now()
+
+    def get_is_active(self, row):
+        return row["menu__end_time"] > self.now
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.conditional import bump_etag_scopes
+from apps.orders.models import Order, OrderItem
+
+
+@receiver([post_save, post_delete], sender=Order)
+def bump_order_etags(sender, instance, **kwargs):
+    # Reserved quantities feed remaining_quantity in the menu listing
+    bump_etag_scopes("reservations", f"orders:{instance.user_id}")
+
+
+@receiver([post_save, post_delete], sender=OrderItem)
+def bump_order_item_etags(sender, instance, **kwargs):
+    bump_etag_scopes("reservations", f"orders:{instance.order.user_id}")
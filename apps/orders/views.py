@@ -7,9 +7,18 @@ from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.common.conditional import ConditionalGetMixin
 from apps.common.mixins import PermissionMixin, VerifiedCustomerMixin
+from apps.common.pagination import EstimatedCountPagination
+from apps.common.values_serializers import ValuesListMixin
+from apps.menus.models import Menu
 from apps.orders.models import Order
-from apps.orders.serializers import OrderCancelSerializer, OrderCreateSerializer, OrderListSerializer
+from apps.orders.serializers import (
+    OrderCancelSerializer,
+    OrderCreateSerializer,
+    OrderListSerializer,
+    OrderListValuesSerializer,
+)
 from apps.wallets.serializers import CapturePaymentSerializer, RefundPaymentSerializer
 
 
@@ -24,8 +33,21 @@ class _MeMixin(VerifiedCustomerMixin):
     ),
     post=extend_schema(summary="Customer: Place an order."),
 )
-class OrderCreateView(ListCreateAPIView):
+class OrderCreateView(ConditionalGetMixin, ValuesListMixin, ListCreateAPIView):
     queryset = Order.objects.all()
+    pagination_class = EstimatedCountPagination
+    values_serializer_class = OrderListValuesSerializer
+
+    def get_etag_scopes(self):
+        # Only a customer's own list; the staff view of all orders changes constantly
+        if self.request.user.is_staff:
+            return None
+        return {
+            f"orders:{self.request.user.id}": None,
+            "catalogue": None,
+            # is_active flips when a menu ends
+            "menu-ends": lambda: Menu.next_time("end_time"),
+        }
 
     def get_queryset(self):
         qs = Order.objects.select_related("menu").prefetch_related("items__menu_item__item")
@@ -50,7 +72,7 @@ class OrderByNumberView(RetrieveAPIView):
     permission_classes = [IsAdminUser]
     serializer_class = OrderListSerializer
     lookup_field = "order_no"
-    queryset = Order.objects.all()
+    queryset = Order.objects.select_related("menu").prefetch_related("items__menu_item__item")
 
 
 @extend_schema(deprecated=True, description="Use `/orders/capture/` instead.")
@@ -0,0 +1,40 @@
+from django.contrib import admin
+from unfold.admin import ModelAdmin
+
+from apps.reports.models import DailyCategorySales, DailySalesSummary
+
+
+class _RollupAdmin(ModelAdmin):
+    """Rollups are derived data, rebuilt by refresh_rollups: read-only in the admin."""
+
+    list_filter = ("menu_type", "day")
+    date_hierarchy = "day"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DailySalesSummary)
+class DailySalesSummaryAdmin(_RollupAdmin):
+    list_display = (
+        "day",
+        "menu_type",
+        "orders",
+        "cancelled_orders",
+        "items_sold",
+        "sales_amount",
+        "payments",
+        "refunds",
+    )
+
+
+@admin.register(DailyCategorySales)
+class DailyCategorySalesAdmin(_RollupAdmin):
+    list_display = ("day", "menu_type", "category", "items_sold", "sales_amount")
+    list_select_related = ("category",)
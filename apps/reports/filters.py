@@ -0,0 +1,13 @@
+import django_filters
+
+from apps.common.constants import MenuType
+
+
+class DailySalesFilter(django_filters.FilterSet):
+    date_from = django_filters.DateFilter(field_name="day", lookup_expr="gte")
+    date_to = django_filters.DateFilter(field_name="day", lookup_expr="lte")
+    menu_type = django_filters.ChoiceFilter(choices=MenuType.choices)
+
+
+class DailyCategorySalesFilter(DailySalesFilter):
+    category = django_filters.UUIDFilter(field_name="category_id")
@@ -0,0 +1,37 @@
+from datetime import date
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reports.exports import DATASETS, EXPORT_FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    help = "Stream orders, order items or transactions as CSV/JSONL with constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(DATASETS))
+        parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+        parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="YYYY-MM-DD, inclusive")
+        parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="YYYY-MM-DD, inclusive")
+        parser.add_argument("--menu", help="Only rows belonging to this menu ID")
+        parser.add_argument("--output", "-o", help="Output file (default: stdout)")
+
+    def handle(self, *args, **options):
+        if options["date_from"] and options["date_to"] and options["date_from"] > options["date_to"]:
+            raise CommandError("--from must be on or before --to")
+
+        chunks = stream_export(
+            DATASETS[options["dataset"]],
+            options["format"],
+            date_from=options["date_from"],
+            date_to=options["date_to"],
+            menu_id=options["menu"],
+        )
+
+        if options["output"]:
+            with Path(options["output"]).open("w", newline="", encoding="utf-8") as out:
+                out.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.reports.rollups import refresh_daily_sales
+
+
+class Command(BaseCommand):
+    help = "Incrementally refresh the daily sales rollups from the last watermark."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Rebuild all days instead of only changed ones")
+        parser.add_argument("--interval", type=int, default=0, help="Keep running, refreshing every N seconds")
+
+    def handle(self, *args, **options):
+        full = options["full"]
+        while True:
+            days = refresh_daily_sales(full=full)
+            if days is None:
+                self.stdout.write(self.style.SUCCESS("Rebuilt daily sales rollups for all days"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Refreshed daily sales rollups for {len(days)} day(s)"))
+
+            if not options["interval"]:
+                return
+            full = False
+            time.sleep(options["interval"])
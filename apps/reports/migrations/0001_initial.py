@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:24
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('menus', '0003_alter_menuitem_override_price'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'report_rollup_watermark',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailySalesSummary',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('day', models.DateField()),
+                ('menu_type', models.CharField(choices=[('breakfast', 'Breakfast'), ('lunch', 'Lunch'), ('dinner', 'Dinner')], max_length=20)),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('cancelled_orders', models.PositiveIntegerField(default=0)),
+                ('items_sold', models.PositiveIntegerField(default=0)),
+                ('sales_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('payments', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('refunds', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+            ],
+            options={
+                'verbose_name_plural': 'Daily sales',
+                'db_table': 'report_daily_sales',
+                'ordering': ['-day', 'menu_type'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'menu_type'), name='uniq_daily_sales_day_menu_type')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyCategorySales',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('day', models.DateField()),
+                ('menu_type', models.CharField(choices=[('breakfast', 'Breakfast'), ('lunch', 'Lunch'), ('dinner', 'Dinner')], max_length=20)),
+                ('items_sold', models.PositiveIntegerField(default=0)),
+                ('sales_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('category', models.ForeignKey(db_column='category_id', on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='menus.category')),
+            ],
+            options={
+                'verbose_name_plural': 'Daily category sales',
+                'db_table': 'report_daily_category_sales',
+                'ordering': ['-day', 'menu_type'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'menu_type', 'category'), name='uniq_daily_category_sales_day_menu_type_category')],
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.db import models
+
+from apps.common.constants import MenuType
+from apps.common.models import BaseModel
+from apps.menus.models import Category
+
+
+class DailySalesSummary(BaseModel):
+    """Per service day (local date of the menu start) and menu type. Maintained by apps.reports.rollups."""
+
+    day = models.DateField()
+    menu_type = models.CharField(max_length=20, choices=MenuType.choices)
+    orders = models.PositiveIntegerField(default=0)
+    cancelled_orders = models.PositiveIntegerField(default=0)
+    items_sold = models.PositiveIntegerField(default=0)
+    # Total of non-cancelled orders
+    sales_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Completed payment / refund transactions
+    payments = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    refunds = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "report_daily_sales"
+        ordering = ["-day", "menu_type"]
+        constraints = [models.UniqueConstraint(fields=["day", "menu_type"], name="uniq_daily_sales_day_menu_type")]
+        verbose_name_plural = "Daily sales"
+
+    def __str__(self):
+        return f"{self.day} · {self.menu_type}"
+
+
+class DailyCategorySales(BaseModel):
+    day = models.DateField()
+    menu_type = models.CharField(max_length=20, choices=MenuType.choices)
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name="daily_sales",
+        db_column="category_id",
+    )
+    items_sold = models.PositiveIntegerField(default=0)
+    sales_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "report_daily_category_sales"
+        ordering = ["-day", "menu_type"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "menu_type", "category"], name="uniq_daily_category_sales_day_menu_type_category"
+            )
+        ]
+        verbose_name_plural = "Daily category sales"
+
+    def __str__(self):
+        return f"{self.day} · {self.menu_type} · {self.category_id}"
+
+
+class RollupWatermark(BaseModel):
+    """Last time a rollup was refreshed; rows changed after it are picked up by the next refresh."""
+
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+
+    class Meta:
+        db_table = "report_rollup_watermark"
+
+    def __str__(self):
+        return f"{self.name} @ {self.value}"
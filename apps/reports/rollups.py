@@ -0,0 +1,186 @@
+"""
+Incremental daily sales rollups.
+
+Sales are bucketed by service day (local date of the menu's start time) and menu type.
+A refresh finds the days touched by orders, order items, order transactions and menus
+updated since the stored watermark and recomputes exactly those days, so late status changes
+(cancellations, refunds) are folded in without rescanning history.
+
+The watermark is read back with ROLLUP_WATERMARK_OVERLAP subtracted: ``updated_at`` is set
+when a row is written, not when its transaction commits, so a write that was still
+uncommitted when a refresh started carries a timestamp before the watermark.
+Hard deletes, a menu moved away from a day and items moved to another category leave no
+updated row behind; the last ROLLUP_RECENT_DAYS service days are therefore recomputed on
+every refresh, and older days only by ``refresh_rollups --full``.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.common.constants import OrderStatus, TransactionStatus, TransactionType
+from apps.menus.models import Menu
+from apps.orders.models import Order, OrderItem
+from apps.reports.models import DailyCategorySales, DailySalesSummary, RollupWatermark
+from apps.wallets.models import Transaction
+
+logger = logging.getLogger(__name__)
+
+DAILY_SALES_WATERMARK = "daily_sales"
+ZERO = Decimal("0.00")
+
+
+def _day_filter(start_time_lookup: str, days: set[date]) -> Q:
+    """Half-open start-time ranges for ``days`` (keeps the menu.start_time index usable)."""
+
+    def day_range(day):
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        return Q(**{f"{start_time_lookup}__gte": start, f"{start_time_lookup}__lt": start + timedelta(days=1)})
+
+    return reduce(or_, (day_range(day) for day in sorted(days)))
+
+
+def _changed_days(since: datetime) -> set[date]:
+    sources = (
+        (Order.objects.filter(updated_at__gte=since), "menu__start_time"),
+        (OrderItem.objects.filter(updated_at__gte=since), "order__menu__start_time"),
+        (Transaction.objects.filter(updated_at__gte=since, order__isnull=False), "order__menu__start_time"),
+        # A moved or retyped menu takes its orders to the new day (the old one is only caught as a recent day)
+        (Menu.objects.filter(updated_at__gte=since, orders__isnull=False), "start_time"),
+    )
+    days = set()
+    for qs, start_time_lookup in sources:
+        days.update(qs.annotate(day=TruncDate(start_time_lookup)).values_list("day", flat=True).distinct())
+    return days
+
+
+def _recent_days() -> set[date]:
+    today = timezone.localdate()
+    return {today - timedelta(days=offset) for offset in range(settings.ROLLUP_RECENT_DAYS)}
+
+
+def _aggregate(days: set[date] | None):
+    orders = Order.objects.all()
+    items = OrderItem.objects.exclude(order__status=OrderStatus.CANCELLED)
+    money = Transaction.objects.filter(
+        status=TransactionStatus.COMPLETED,
+        type__in=[TransactionType.PAYMENT, TransactionType.REFUND],
+        order__isnull=False,
+    )
+    if days is not None:
+        orders = orders.filter(_day_filter("menu__start_time", days))
+        items = items.filter(_day_filter("order__menu__start_time", days))
+        money = money.filter(_day_filter("order__menu__start_time", days))
+
+    summaries = defaultdict(
+        lambda: {
+            "orders": 0,
+            "cancelled_orders": 0,
+            "items_sold": 0,
+            "sales_amount": ZERO,
+            "payments": ZERO,
+            "refunds": ZERO,
+        }
+    )
+
+    cancelled = Q(status=OrderStatus.CANCELLED)
+    for row in (
+        orders.annotate(day=TruncDate("menu__start_time"))
+        .values("day", menu_type=F("menu__type"))
+        .annotate(
+            order_count=Count("id"),
+            cancelled_count=Count("id", filter=cancelled),
+            total=Sum("total_amount", filter=~cancelled),
+        )
+    ):
+        summary = summaries[row["day"], row["menu_type"]]
+        summary["orders"] = row["order_count"]
+        summary["cancelled_orders"] = row["cancelled_count"]
+        summary["sales_amount"] = row["total"] or ZERO
+
+    categories = []
+    for row in (
+        items.annotate(day=TruncDate("order__menu__start_time"))
+        .values("day", menu_type=F("order__menu__type"), category=F("menu_item__item__category_id"))
+        .annotate(quantity_sum=Sum("quantity"), total=Sum("total_price"))
+    ):
+        summaries[row["day"], row["menu_type"]]["items_sold"] += row["quantity_sum"]
+        categories.append(
+            DailyCategorySales(
+                day=row["day"],
+                menu_type=row["menu_type"],
+                category_id=row["category"],
+                items_sold=row["quantity_sum"],
+                sales_amount=row["total"],
+            )
+        )
+
+    for row in (
+        money.annotate(day=TruncDate("order__menu__start_time"))
+        .values("day", menu_type=F("order__menu__type"))
+        .annotate(
+            payment_sum=Sum("amount", filter=Q(type=TransactionType.PAYMENT)),
+            refund_sum=Sum("amount", filter=Q(type=TransactionType.REFUND)),
+        )
+    ):
+        summary = summaries[row["day"], row["menu_type"]]
+        summary["payments"] = row["payment_sum"] or ZERO
+        summary["refunds"] = row["refund_sum"] or ZERO
+
+    summary_rows = [
+        DailySalesSummary(day=day, menu_type=menu_type, **values) for (day, menu_type), values in summaries.items()
+    ]
+    return summary_rows, categories
+
+
+def rebuild_days(days: set[date] | None = None) -> int:
+    """Recompute the rollups for ``days`` (all history if None). Returns the number of summary rows written."""
+    summaries, categories = _aggregate(days)
+
+    with transaction.atomic():
+        if days is None:
+            DailySalesSummary.objects.all().delete()
+            DailyCategorySales.objects.all().delete()
+        else:
+            DailySalesSummary.objects.filter(day__in=days).delete()
+            DailyCategorySales.objects.filter(day__in=days).delete()
+        DailySalesSummary.objects.bulk_create(summaries, batch_size=1000)
+        DailyCategorySales.objects.bulk_create(categories, batch_size=1000)
+
+    return len(summaries)
+
+
+def refresh_daily_sales(full: bool = False) -> set[date] | None:
+    """
+    Bring the daily sales rollups up to date. Without a watermark (first run) or with
+    ``full`` everything is rebuilt and None is returned; otherwise the recomputed days
+    (changed since the watermark minus the overlap, plus the recent days).
+    """
+    with transaction.atomic():
+        # Row lock serializes concurrent refreshes
+        watermark = RollupWatermark.objects.select_for_update().filter(name=DAILY_SALES_WATERMARK).first()
+        # Taken before reading so writes racing with this refresh are picked up next time
+        started_at = timezone.now()
+
+        if watermark is None or full:
+            days = None
+        else:
+            since = watermark.value - timedelta(seconds=settings.ROLLUP_WATERMARK_OVERLAP)
+            days = _changed_days(since) | _recent_days()
+
+        if days is None or days:
+            written = rebuild_days(days)
+            logger.info(f"Daily sales rollup refreshed {'all days' if days is None else len(days)} ({written} rows)")
+
+        RollupWatermark.objects.update_or_create(name=DAILY_SALES_WATERMARK, defaults={"value": started_at})
+
+    return days
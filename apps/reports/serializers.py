@@ -0,0 +1,32 @@
+from rest_framework import serializers
+
+from apps.reports.exports import EXPORT_FORMATS
+from apps.reports.models import DailyCategorySales, DailySalesSummary
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    export_format = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default="csv")
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    menu = serializers.UUIDField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("date_from") and attrs.get("date_to") and attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError("date_from must be on or before date_to.")
+        return attrs
+
+
+class DailySalesSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailySalesSummary
+        fields = ["day", "menu_type", "orders", "cancelled_orders", "items_sold", "sales_amount", "payments", "refunds"]
+        read_only_fields = fields
+
+
+class DailyCategorySalesSerializer(serializers.ModelSerializer):
+    category_name = serializers.CharField(source="category.name", read_only=True)
+
+    class Meta:
+        model = DailyCategorySales
+        fields = ["day", "menu_type", "category", "category_name", "items_sold", "sales_amount"]
+        read_only_fields = fields
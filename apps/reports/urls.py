@@ -0,0 +1,13 @@
+from django.urls import path
+
+from apps.reports import views
+
+app_name = "reports"
+
+urlpatterns = [
+    path("exports/orders/", views.OrderExportView.as_view(), name="export-orders"),
+    path("exports/order-items/", views.OrderItemExportView.as_view(), name="export-order-items"),
+    path("exports/transactions/", views.TransactionExportView.as_view(), name="export-transactions"),
+    path("daily-sales/", views.DailySalesView.as_view(), name="daily-sales"),
+    path("daily-sales/categories/", views.DailyCategorySalesView.as_view(), name="daily-category-sales"),
+]
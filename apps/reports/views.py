@@ -0,0 +1,85 @@
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework import generics
+from rest_framework.views import APIView
+
+from apps.common.mixins import PermissionMixin
+from apps.reports.exports import DATASETS, EXPORT_FORMATS, stream_export
+from apps.reports.filters import DailyCategorySalesFilter, DailySalesFilter
+from apps.reports.models import DailyCategorySales, DailySalesSummary
+from apps.reports.serializers import DailyCategorySalesSerializer, DailySalesSummarySerializer, ExportQuerySerializer
+
+
+class _ExportView(PermissionMixin, APIView):
+    dataset_name = None
+
+    def get(self, request):
+        query = ExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        fmt = params["export_format"]
+
+        response = StreamingHttpResponse(
+            stream_export(
+                DATASETS[self.dataset_name],
+                fmt,
+                date_from=params.get("date_from"),
+                date_to=params.get("date_to"),
+                menu_id=params.get("menu"),
+            ),
+            content_type=EXPORT_FORMATS[fmt],
+        )
+        filename = f"{self.dataset_name}-{timezone.localdate():%Y%m%d}.{fmt}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+_export_schema = {
+    "parameters": [ExportQuerySerializer],
+    "responses": {(200, "text/csv"): OpenApiResponse(OpenApiTypes.STR)},
+    "tags": ["reports"],
+}
+
+
+@extend_schema(summary="Staff: Export orders (CSV/JSONL stream)", **_export_schema)
+class OrderExportView(_ExportView):
+    dataset_name = "orders"
+    required_permission = "orders.view_all_orders"
+
+
+@extend_schema(summary="Staff: Export order items (CSV/JSONL stream)", **_export_schema)
+class OrderItemExportView(_ExportView):
+    dataset_name = "order-items"
+    required_permission = "orders.view_all_orders"
+
+
+@extend_schema(summary="Staff: Export wallet transactions (CSV/JSONL stream)", **_export_schema)
+class TransactionExportView(_ExportView):
+    dataset_name = "transactions"
+    required_permission = "wallets.view_all_transactions"
+
+
+@extend_schema(
+    summary="Staff: Daily sales per menu type",
+    description="Reads the daily rollup tables only; refreshed by the `refresh_rollups` command.",
+    tags=["reports"],
+)
+class DailySalesView(PermissionMixin, generics.ListAPIView):
+    serializer_class = DailySalesSummarySerializer
+    required_permission = "reports.view_dailysalessummary"
+    filterset_class = DailySalesFilter
+    queryset = DailySalesSummary.objects.all()
+
+
+@extend_schema(
+    summary="Staff: Daily sales per category and menu type",
+    description="Reads the daily rollup tables only; refreshed by the `refresh_rollups` command.",
+    tags=["reports"],
+)
+class DailyCategorySalesView(PermissionMixin, generics.ListAPIView):
+    serializer_class = DailyCategorySalesSerializer
+    required_permission = "reports.view_dailycategorysales"
+    filterset_class = DailyCategorySalesFilter
+    queryset = DailyCategorySales.objects.select_related("category").order_by("-day", "menu_type", "category__name")
@@ -0,0 +1,61 @@
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.services import bulk_provision_users, read_user_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create users from CSV (header: email,password,first_name,last_name,role,is_verified) or JSONL. "
+        "Only email is required; users without a password get an unusable one (password reset / Microsoft login)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or '-' for stdin")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--workers", type=int, default=None, help="Password hashing processes (0 = in-process)")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or (Path(path).suffix.lstrip(".").lower() if path != "-" else None)
+        if fmt not in ("csv", "jsonl"):
+            raise CommandError("Cannot infer input format, pass --format csv|jsonl")
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size must be positive")
+
+        start = time.perf_counter()
+
+        def progress(report):
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"created {report.created}, skipped {report.skipped}, errors {len(report.errors)} "
+                f"({report.created / elapsed:.0f} users/s)"
+            )
+
+        stream = sys.stdin if path == "-" else Path(path).open(newline="", encoding="utf-8")  # noqa: SIM115
+        try:
+            report = bulk_provision_users(
+                read_user_records(stream, fmt),
+                chunk_size=options["chunk_size"],
+                workers=options["workers"],
+                on_progress=progress,
+            )
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for error in report.errors:
+            self.stderr.write(error)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.created} users in {time.perf_counter() - start:.1f}s "
+                f"({report.skipped} skipped, {len(report.errors)} invalid)"
+            )
+        )
@@ -1,8 +1,11 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, Group, PermissionsMixin
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
 
 from apps.common.constants import ROLE_GROUP_NAMES, UserRole
 from apps.common.models import BaseModel
+from apps.common.rbac import get_role_group_ids, invalidate_user_grants
+
+ROLE_SYNC_FIELDS = ("role", "is_verified")
 
 
 class UserManager(BaseUserManager):
@@ -57,44 +60,68 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded role state so save() can detect changes without re-reading the row
+        if all(field in field_names for field in ROLE_SYNC_FIELDS):
+            instance._loaded_role_state = (instance.role, instance.is_verified)
+        return instance
+
+    def _get_loaded_role_state(self):
+        if hasattr(self, "_loaded_role_state"):
+            return self._loaded_role_state
+        return User.objects.filter(pk=self.pk).values_list(*ROLE_SYNC_FIELDS).first()
+
     def save(self, *args, **kwargs):
-        is_new = self.pk is None
-        old_role = None
-        old_verified = None
+        is_new = self._state.adding
+        update_fields = kwargs.get("update_fields")
 
-        if not is_new:
-            try:
-                old_user = User.objects.only("role", "is_verified").get(pk=self.pk)
-                old_role = old_user.role
-                old_verified = old_user.is_verified
-            except User.DoesNotExist:
-                old_role = None
-                old_verified = None
-        else:
-            old_role = None
-            old_verified = None
+        if not is_new and update_fields is not None and not set(ROLE_SYNC_FIELDS) & set(update_fields):
+            super().save(*args, **kwargs)
+            return
+
+        old_state = None if is_new else self._get_loaded_role_state()
 
         super().save(*args, **kwargs)
 
-        if is_new or old_role != self.role or old_verified != self.is_verified:
+        if is_new or old_state != (self.role, self.is_verified):
             try:
                 self.assign_group_by_role()
             except (Group.DoesNotExist, ValueError) as e:
                 print(f"Warning: Could not assign groups for user {self.email}: {e}")
 
+        self._loaded_role_state = (self.role, self.is_verified)
+
     def assign_group_by_role(self):
-        role_group_names = ROLE_GROUP_NAMES
+        try:
+            self._replace_role_group(get_role_group_ids())
+        except IntegrityError:
+            # A role group was recreated since the ids were cached: retry with fresh ones
+            self._replace_role_group(get_role_group_ids(refresh=True))
+
+        # The through rows were written directly, without m2m_changed
+        invalidate_user_grants([self.pk])
+        # Drop per-instance caches built from the previous membership
+        for attr in ("_rbac_grants", "_perm_cache", "_group_perm_cache"):
+            self.__dict__.pop(attr, None)
+
+    def _replace_role_group(self, role_group_ids):
+        group_name = self.get_group_name()
+        through = User.groups.through
 
-        role_groups = Group.objects.filter(name__in=role_group_names)
-        if role_groups.exists():
-            self.groups.remove(*role_groups)
+        stale_ids = [group_id for name, group_id in role_group_ids.items() if name != group_name]
 
-        group_name = self.get_group_name()
-        if group_name:
-            try:
-                group = Group.objects.get(name=group_name)
-                self.groups.add(group)
-            except Group.DoesNotExist:
+        with transaction.atomic():
+            through.objects.filter(user_id=self.pk, group_id__in=stale_ids).delete()
+
+            if group_name in role_group_ids:
+                through.objects.bulk_create(
+                    [through(user_id=self.pk, group_id=role_group_ids[group_name])], ignore_conflicts=True
+                )
+                # Foreign keys are deferred: fail on a stale group id here, not at some outer commit
+                connection.check_constraints(table_names=[through._meta.db_table])
+            elif group_name:
                 print(f"Warning: Group '{group_name}' does not exist for user {self.email}")
 
     def is_verified_customer(self):
@@ -0,0 +1,210 @@
+import csv
+import json
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from apps.common.constants import ROLE_GROUP_NAMES, UserRole
+from apps.common.rbac import get_role_group_ids
+from apps.users.models import User
+from apps.users.utils import extract_name_from_email
+from apps.wallets.models import Balance
+
+
+@dataclass
+class ProvisioningReport:
+    created: int = 0
+    skipped: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass
+class InputRecord:
+    """A record read from an input file, with its line number for error reports."""
+
+    line: int
+    fields: dict
+
+
+@dataclass
+class InvalidRecord:
+    """A line of the input that is not a record at all, reported instead of aborting the import."""
+
+    line: int
+    message: str
+
+
+def read_user_records(stream, fmt: str) -> Iterator[InputRecord | InvalidRecord]:
+    """Yield user records from a CSV (with header) or JSONL text stream, and an InvalidRecord per unreadable line."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        while True:
+            try:
+                record = next(reader)
+                yield InputRecord(reader.line_num, record)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield InvalidRecord(reader.line_num, f"invalid CSV: {e}")
+    elif fmt == "jsonl":
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield InvalidRecord(number, f"invalid JSON: {e.msg}")
+                continue
+            if isinstance(record, dict):
+                yield InputRecord(number, record)
+            else:
+                yield InvalidRecord(number, f"expected a JSON object, got {type(record).__name__}")
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _text(record: dict, name: str, max_length: int | None = None) -> str | None:
+    """A text field of the record, stripped; None when absent or empty."""
+    value = record.get(name)
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValidationError(f"{name} must be a string, got {type(value).__name__}")
+    value = value.strip()
+    if max_length is not None and len(value) > max_length:
+        raise ValidationError(f"{name} is longer than {max_length} characters")
+    return value or None
+
+
+def _clean_record(record: dict) -> dict:
+    max_lengths = {name: User._meta.get_field(name).max_length for name in ("email", "first_name", "last_name")}
+
+    # Like UserManager.create_user: only the domain part is lowercased
+    email = User.objects.normalize_email(_text(record, "email", max_lengths["email"]) or "")
+    validate_email(email)
+
+    role = (_text(record, "role") or UserRole.CUSTOMER).lower()
+    if role not in UserRole.values:
+        raise ValidationError(f"Unknown role '{role}'")
+
+    is_verified = record.get("is_verified", False)
+    if isinstance(is_verified, str):
+        is_verified = is_verified.strip().lower() in ("1", "true", "yes")
+    elif not isinstance(is_verified, bool) and is_verified is not None:
+        raise ValidationError(f"is_verified must be a boolean, got {type(is_verified).__name__}")
+
+    password = record.get("password")
+    if password is not None and not isinstance(password, str):
+        raise ValidationError(f"password must be a string, got {type(password).__name__}")
+
+    first_name, last_name = extract_name_from_email(email)
+    return {
+        "email": email,
+        "password": password or None,
+        "first_name": _text(record, "first_name", max_lengths["first_name"]) or first_name[: max_lengths["first_name"]],
+        "last_name": _text(record, "last_name", max_lengths["last_name"]) or last_name[: max_lengths["last_name"]],
+        "role": role,
+        "is_verified": bool(is_verified),
+    }
+
+
+def _hash_passwords(passwords: list[str | None], executor: ProcessPoolExecutor | None) -> list[str]:
+    # make_password(None) is an unusable password and costs nothing; only real ones go to the pool
+    hashes = [make_password(None) if password is None else None for password in passwords]
+    pending = [(i, password) for i, password in enumerate(passwords) if password is not None]
+    if pending:
+        to_hash = [password for _, password in pending]
+        results = executor.map(make_password, to_hash, chunksize=8) if executor else map(make_password, to_hash)
+        for (i, _), hashed in zip(pending, results, strict=True):
+            hashes[i] = hashed
+    return hashes
+
+
+def bulk_provision_users(
+    records: Iterable[dict | InputRecord | InvalidRecord],
+    *,
+    chunk_size: int = 1000,
+    workers: int | None = None,
+    on_progress: Callable[[ProvisioningReport], None] | None = None,
+) -> ProvisioningReport:
+    """
+    Create users with their balances and role-group memberships in bulk.
+
+    Bypasses User.save and the balance post_save signal, so everything they do is
+    replicated here with bulk_create. Existing emails (compared case-insensitively) are
+    skipped, invalid records are reported and the rest imported. Passwords are hashed in a process pool (``workers=0``
+    hashes in-process). Raises ValueError before writing anything if a role group is missing.
+    """
+    report = ProvisioningReport()
+    role_group_ids = get_role_group_ids()
+    missing_groups = [name for name in ROLE_GROUP_NAMES if name not in role_group_ids]
+    if missing_groups:
+        # Users would be created without their role's permissions
+        raise ValueError(f"Role groups missing: {', '.join(missing_groups)}. Run `manage.py migrate` to create them")
+    seen = set()
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    try:
+        for chunk in _chunks(records, chunk_size):
+            cleaned = []
+            for record in chunk:
+                if isinstance(record, InvalidRecord):
+                    report.errors.append(f"line {record.line}: {record.message}")
+                    continue
+                if isinstance(record, InputRecord):
+                    label, record = f"line {record.line}", record.fields
+                else:
+                    label = repr(record.get("email"))
+                try:
+                    data = _clean_record(record)
+                except ValidationError as e:
+                    report.errors.append(f"{label}: {'; '.join(e.messages)}")
+                    continue
+                # Case-insensitively: Ion.Pop@ and ion.pop@ must not become two logins
+                if data["email"].lower() in seen:
+                    report.skipped += 1
+                    continue
+                seen.add(data["email"].lower())
+                cleaned.append(data)
+
+            emails = [data["email"].lower() for data in cleaned]
+            existing = set(
+                User.objects.annotate(email_lower=Lower("email"))
+                .filter(email_lower__in=emails)
+                .values_list("email_lower", flat=True)
+            )
+            report.skipped += len(existing)
+            cleaned = [data for data in cleaned if data["email"].lower() not in existing]
+
+            hashes = _hash_passwords([data.pop("password") for data in cleaned], executor)
+            users = [User(password=hashed, **data) for data, hashed in zip(cleaned, hashes, strict=True)]
+
+            through = User.groups.through
+            memberships = [through(user_id=user.pk, group_id=role_group_ids[user.get_group_name()]) for user in users]
+
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                Balance.objects.bulk_create([Balance(user=user) for user in users])
+                through.objects.bulk_create(memberships)
+
+            report.created += len(users)
+            if on_progress:
+                on_progress(report)
+    finally:
+        if executor:
+            executor.shutdown()
+
+    return report
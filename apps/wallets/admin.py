@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin, TabularInline
 
+from apps.common.pagination import EstimatedCountPaginator
 from apps.wallets.models import Balance, Transaction
 
 
@@ -11,6 +12,10 @@ class TransactionInline(TabularInline):
     exclude = ("deleted_at",)
     ordering = ("-created_at",)
 
+    def get_queryset(self, request):
+        # order is rendered via Order.__str__ (order_no + user)
+        return super().get_queryset(request).select_related("order__user")
+
     def get_readonly_fields(self, request, obj=None):
         if request.user.is_superuser or request.user.has_perm("wallets.change_transaction"):
             return ("signed_amount", "created_at")
@@ -43,6 +48,9 @@ class BalanceAdmin(ModelAdmin):
     exclude = ("deleted_at",)
     inlines = [TransactionInline]
     autocomplete_fields = ["user"]
+    list_select_related = ("user",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def current_balance_colored(self, obj):
         color = "green" if obj.current_balance > 0 else "red" if obj.current_balance < 0 else "black"
@@ -78,6 +86,9 @@ class TransactionAdmin(ModelAdmin):
     exclude = ("deleted_at",)
     autocomplete_fields = ["balance", "order"]
     date_hierarchy = "created_at"
+    list_select_related = ("balance__user", "order")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def balance_user(self, obj):
         return obj.balance.user
@@ -3,6 +3,7 @@ from decimal import Decimal
 from rest_framework import serializers
 
 from apps.common.constants import TransactionType
+from apps.common.values_serializers import ValuesSerializer
 from apps.orders.models import Order
 from apps.wallets.models import Balance, Transaction
 from apps.wallets.services import WalletError, capture_payment_by_staff, deposit, refund_payment_by_staff
@@ -44,6 +45,15 @@ class TransactionPublicSerializer(serializers.ModelSerializer):
         return obj.amount
 
 
+class TransactionPublicValuesSerializer(ValuesSerializer):
+    serializer_class = TransactionPublicSerializer
+
+    def get_signed_amount(self, row):
+        if row["type"] in [TransactionType.PAYMENT, TransactionType.HOLD]:
+            return -row["amount"]
+        return row["amount"]
+
+
 class DepositSerializer(serializers.ModelSerializer):
     amount = serializers.DecimalField(
         max_digits=10,
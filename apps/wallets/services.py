@@ -7,6 +7,7 @@ from django.db import transaction
 from django.db.models import F
 from django.utils import timezone
 
+from apps.common.conditional import bump_etag_scopes
 from apps.common.constants import OrderStatus, TransactionStatus, TransactionType
 from apps.orders.models import Order
 from apps.wallets.models import Balance, Transaction
@@ -31,6 +32,8 @@ def _quantize(amount: Decimal) -> Decimal:
 
 def _get_locked_balance_for_user(user) -> Balance:
     balance, _ = Balance.objects.get_or_create(user=user)
+    # Balances change through queryset.update(), which sends no signals
+    bump_etag_scopes(f"wallet:{balance.user_id}")
     return Balance.objects.select_for_update().get(pk=balance.pk)
 
 
@@ -92,7 +95,7 @@ def place_hold(user, order_id) -> WalletResult:
     )
 
     order.status = OrderStatus.CONFIRMED
-    order.save(update_fields=["status"])
+    order.save(update_fields=["status", "updated_at"])
 
     return WalletResult(transaction=tx, balance=balance, order=order)
 
@@ -141,8 +144,8 @@ def capture_payment_by_staff(user, order_id) -> WalletResult:
     balance.refresh_from_db(fields=["current_balance", "on_hold"])
 
     # Find and update the existing HOLD transaction
-    hold_transaction = Transaction.objects.filter(
-        balance=balance, order=order, type=TransactionType.HOLD, status=TransactionStatus.PENDING
+    hold_transaction = balance.transactions.filter(
+        order=order, type=TransactionType.HOLD, status=TransactionStatus.PENDING
     ).first()
 
     if hold_transaction:
@@ -150,7 +153,7 @@ def capture_payment_by_staff(user, order_id) -> WalletResult:
         hold_transaction.type = TransactionType.PAYMENT
         hold_transaction.status = TransactionStatus.COMPLETED
         hold_transaction.remaining_balance = balance.current_balance
-        hold_transaction.save(update_fields=["type", "status", "remaining_balance"])
+        hold_transaction.save(update_fields=["type", "status", "remaining_balance", "updated_at"])
         tx = hold_transaction
     else:
         # Fallback: create new PAYMENT transaction (shouldn't happen in normal flow)
@@ -164,7 +167,7 @@ def capture_payment_by_staff(user, order_id) -> WalletResult:
         )
 
     order.status = OrderStatus.PAID
-    order.save(update_fields=["status"])
+    order.save(update_fields=["status", "updated_at"])
 
     return WalletResult(transaction=tx, balance=balance, order=order)
 
@@ -198,7 +201,7 @@ def refund_payment_by_staff(user, order_id) -> WalletResult:
     )
 
     order.status = OrderStatus.CANCELLED
-    order.save(update_fields=["status"])
+    order.save(update_fields=["status", "updated_at"])
 
     return WalletResult(transaction=tx, balance=balance, order=order)
 
@@ -241,16 +244,16 @@ def cancel_order_with_hold_release(user, order_id) -> WalletResult:
         Balance.objects.filter(pk=balance.pk).update(on_hold=F("on_hold") - amount)
         balance.refresh_from_db(fields=["current_balance", "on_hold"])
 
-        hold_transaction = Transaction.objects.filter(
-            balance=balance, order=order, type=TransactionType.HOLD, status=TransactionStatus.PENDING
+        hold_transaction = balance.transactions.filter(
+            order=order, type=TransactionType.HOLD, status=TransactionStatus.PENDING
         ).first()
 
         if hold_transaction:
             hold_transaction.status = TransactionStatus.CANCELLED
-            hold_transaction.save(update_fields=["status"])
+            hold_transaction.save(update_fields=["status", "updated_at"])
 
     order.status = OrderStatus.CANCELLED
-    order.save(update_fields=["status"])
+    order.save(update_fields=["status", "updated_at"])
 
     return WalletResult(transaction=None, balance=balance, order=order)
 
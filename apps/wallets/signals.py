@@ -1,11 +1,28 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from apps.wallets.models import Balance
+from apps.common.conditional import bump_etag_scopes
+from apps.wallets.models import Balance, Transaction
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_balance(sender, instance, created, **kwargs):
     if created:
         Balance.objects.create(user=instance)
+
+
+@receiver([post_save, post_delete], sender=Balance)
+def bump_balance_etags(sender, instance, **kwargs):
+    bump_etag_scopes(f"wallet:{instance.user_id}")
+
+
+@receiver([post_save, post_delete], sender=Transaction)
+def bump_transaction_etags(sender, instance, **kwargs):
+    # Services create transactions with the balance in hand; anywhere else read just its user_id
+    if Transaction.balance.is_cached(instance):
+        user_id = instance.balance.user_id
+    else:
+        user_id = Balance.objects.filter(pk=instance.balance_id).values_list("user_id", flat=True).first()
+    if user_id is not None:
+        bump_etag_scopes(f"wallet:{user_id}")
@@ -5,7 +5,10 @@ from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schem
 from rest_framework import generics, status
 from rest_framework.response import Response
 
+from apps.common.conditional import ConditionalGetMixin
 from apps.common.mixins import PermissionMixin, VerifiedCustomerMixin
+from apps.common.pagination import EstimatedCountPagination
+from apps.common.values_serializers import ValuesListMixin
 from apps.users.models import User
 from apps.wallets.models import Balance, Transaction
 from apps.wallets.serializers import (
@@ -15,6 +18,7 @@ from apps.wallets.serializers import (
     DepositSerializer,
     SessionStatusResponseSerializer,
     TransactionPublicSerializer,
+    TransactionPublicValuesSerializer,
 )
 from apps.wallets.services import StripeService, WalletError
 
@@ -101,9 +105,11 @@ class WalletDepositView(PermissionMixin, generics.CreateAPIView):
     responses={200: TransactionPublicSerializer(many=True)},
     tags=["wallets"],
 )
-class WalletTransactionListView(PermissionMixin, generics.ListAPIView):
+class WalletTransactionListView(PermissionMixin, ValuesListMixin, generics.ListAPIView):
     serializer_class = TransactionPublicSerializer
+    values_serializer_class = TransactionPublicValuesSerializer
     required_permission = "wallets.view_all_transactions"
+    pagination_class = EstimatedCountPagination
 
     def get_queryset(self):
         user_id = self.kwargs.get("user_id")
@@ -150,11 +156,14 @@ class WalletTransactionDetailView(PermissionMixin, generics.RetrieveAPIView):
     responses={200: BalanceSerializer},
     tags=["wallets"],
 )
-class WalletDetailMeView(_MeMixin, generics.RetrieveAPIView):
+class WalletDetailMeView(_MeMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     serializer_class = BalanceSerializer
     required_permission = "wallets.view_own_balance"
     lookup_url_kwarg = None
 
+    def get_etag_scopes(self):
+        return {f"wallet:{self.request.user.id}": None}
+
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
@@ -188,10 +197,15 @@ class WalletDetailMeView(_MeMixin, generics.RetrieveAPIView):
         )
     ],
 )
-class WalletTransactionsMeView(_MeMixin, generics.ListAPIView):
+class WalletTransactionsMeView(_MeMixin, ConditionalGetMixin, ValuesListMixin, generics.ListAPIView):
     serializer_class = TransactionPublicSerializer
+    values_serializer_class = TransactionPublicValuesSerializer
     required_permission = "wallets.view_own_transaction"
     lookup_url_kwarg = None
+    pagination_class = EstimatedCountPagination
+
+    def get_etag_scopes(self):
+        return {f"wallet:{self.request.user.id}": None}
 
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
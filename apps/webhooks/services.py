@@ -1,12 +1,9 @@
 import logging
 
-import stripe
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
-
 
 class StripeWebhookError(Exception):
     pass
@@ -26,6 +23,8 @@ def verify_webhook_signature(payload: bytes, sig_header: str) -> dict:
     Raises:
         StripeWebhookError: If verification fails
     """
+    import stripe
+
     try:
         event = stripe.Webhook.construct_event(payload, sig_header, settings.STRIPE_WEBHOOK_SECRET)
         return event
@@ -0,0 +1,80 @@
+"""
+Gunicorn settings for the production image (``gunicorn -c config/gunicorn_conf.py``).
+
+Every value can be overridden with an environment variable:
+  WEB_CONCURRENCY         worker processes (default: 2 x available CPUs + 1)
+  GUNICORN_THREADS        threads per worker (default 4)
+  GUNICORN_WORKER_CLASS   "gthread" (config.wsgi, default) or "uvicorn_worker.UvicornWorker" (config.asgi)
+  GUNICORN_TIMEOUT, GUNICORN_GRACEFUL_TIMEOUT, GUNICORN_MAX_REQUESTS, GUNICORN_BIND
+  PROMETHEUS_MULTIPROC_DIR  where workers write their /metrics samples (default /tmp/prometheus)
+
+The app is loaded once in the master before forking (``preload_app``), so workers share its
+memory pages copy-on-write and boot instantly. Because of that, HUP only restarts the workers
+with the already loaded code; deploy new code by restarting the container, or with USR2
+(new master) followed by WINCH/QUIT to the old one.
+"""
+
+import math
+import os
+import shutil
+from pathlib import Path
+
+
+def _available_cpus():
+    """CPUs this container may actually use: the cgroup v2 quota if any, else the affinity mask."""
+    cpus = len(os.sched_getaffinity(0))
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:  # noqa: PTH123
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2 * _available_cpus() + 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+# Requests mostly wait on Postgres/Redis, so a few threads per process add concurrency cheaply
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+wsgi_app = "config.asgi:application" if "uvicorn" in worker_class.lower() else "config.wsgi:application"
+
+preload_app = True
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+
+# Recycle workers now and then, staggered, to cap slow memory growth
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = max_requests // 10
+
+# Workers record metrics in files here so /metrics adds up all of them (prometheus_client multiprocess mode);
+# set before the app is loaded, which is when prometheus_client picks its storage
+multiproc_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus")
+
+accesslog = "-"
+errorlog = "-"
+# Trust X-Forwarded-* from the reverse proxy in front of the container
+forwarded_allow_ips = os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def on_starting(server):
+    # Samples of a previous run would otherwise be added to this one's
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    Path(multiproc_dir).mkdir(parents=True)
+
+
+def child_exit(server, worker):
+    # Counters and histograms of an exited worker stay in the totals; only its live gauges go
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    # Never share a database socket opened in the master during preload (Redis pools reset themselves)
+    from django.db import connections
+
+    connections.close_all()
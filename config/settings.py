@@ -37,14 +37,6 @@ ALLOWED_HOSTS = env("ALLOWED_HOSTS")
 
 UNFOLD_APPS = [
     "unfold",
-    "unfold.contrib.filters",
-    "unfold.contrib.forms",
-    "unfold.contrib.inlines",
-    "unfold.contrib.import_export",
-    "unfold.contrib.guardian",
-    "unfold.contrib.simple_history",
-    "unfold.contrib.location_field",
-    "unfold.contrib.constance",
 ]
 
 STD_APPS = [
@@ -61,7 +53,6 @@ REMOTE_APPS = [
     "drf_spectacular",
     "django_filters",
     "rest_framework_simplejwt.token_blacklist",
-    "imagekit",
     "corsheaders",
 ]
 
@@ -73,6 +64,7 @@ LOCAL_APPS = [
     "apps.wallets",
     "apps.users",
     "apps.webhooks",
+    "apps.reports",
 ]
 
 INSTALLED_APPS = [*UNFOLD_APPS, *STD_APPS, *REMOTE_APPS, *LOCAL_APPS]
@@ -89,7 +81,10 @@ SIMPLE_JWT = {
 }
 
 MIDDLEWARE = [
+    "apps.common.middleware.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "apps.common.middleware.CompressionMiddleware",
+    "apps.common.middleware.QueryCountHeaderMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -140,11 +135,30 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
-    "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+    "DEFAULT_RENDERER_CLASSES": ("apps.common.renderers.ORJSONRenderer",),
+    "DEFAULT_PARSER_CLASSES": (
+        "apps.common.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
+    # Reverse proxies in front of the app that append to X-Forwarded-For; 0 keys throttles on REMOTE_ADDR
+    "NUM_PROXIES": env.int("NUM_PROXIES", default=0),
+    # Scopes used by apps.common.throttling (per IP, and "<scope>_account" per target account)
+    "DEFAULT_THROTTLE_RATES": {
+        "login": "30/min",
+        "login_account": "10/min",
+        "register": "10/hour",
+        "email_resend": "10/hour",
+        "email_resend_account": "3/hour",
+        "password_reset": "10/hour",
+        "password_reset_account": "3/hour",
+        "mfa_verify": "30/min",
+        "mfa_verify_account": "5/min",
+    },
 }
 
 SPECTACULAR_SETTINGS = {
@@ -277,9 +291,33 @@ DATABASES = {
         "PASSWORD": env("SQL_PASSWORD"),
         "HOST": env("SQL_HOST"),
         "PORT": env("SQL_PORT"),
+        # Keep connections open between requests (re-checked before reuse) instead of reconnecting every time
+        "CONN_MAX_AGE": env.int("SQL_CONN_MAX_AGE", default=60),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+if "postgresql" in DATABASES["default"]["ENGINE"]:
+    if env.bool("SQL_POOL", default=False):
+        # psycopg's connection pool (psycopg[pool]); persistent connections don't apply then
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"] = {
+            "pool": {
+                "min_size": env.int("SQL_POOL_MIN_SIZE", default=2),
+                "max_size": env.int("SQL_POOL_MAX_SIZE", default=10),
+                "timeout": env.float("SQL_POOL_TIMEOUT", default=10.0),
+            }
+        }
+    if env.bool("SQL_PGBOUNCER", default=False):
+        # pgbouncer in transaction mode: a server connection only lasts for one transaction, so no
+        # server-side cursors (iterator()) or prepared statements across transactions. Row locks
+        # (select_for_update) are taken inside transaction.atomic() and are unaffected.
+        DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+        DATABASES["default"].setdefault("OPTIONS", {})["prepare_threshold"] = None
+
+# Above this many rows (planner estimate) paginators report an estimated instead of an exact count
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = env.int("PAGINATION_COUNT_ESTIMATE_THRESHOLD", default=10_000)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -329,18 +367,72 @@ EMAIL_USE_TLS = False
 EMAIL_USE_SSL = False
 DEFAULT_FROM_EMAIL = "no-reply@canteen.utm.md"
 
-# Redis
+# Rate limiting of auth endpoints (apps.common.throttling); disable for load tests
+RATELIMIT_ENABLED = env.bool("RATELIMIT_ENABLED", default=True)
+
+# Outbound mail queue (delivered by `manage.py send_queued_mail`)
+MAIL_QUEUE_ENABLED = env.bool("MAIL_QUEUE_ENABLED", default=True)
+MAIL_QUEUE_MAX_ATTEMPTS = env.int("MAIL_QUEUE_MAX_ATTEMPTS", default=5)
+
+# Adds X-DB-Query-Count to every response (used by loadtest/locustfile.py)
+QUERY_COUNT_HEADER = env.bool("QUERY_COUNT_HEADER", default=False)
+
+# Server-Timing header and Prometheus metrics at /metrics (apps.common.metrics)
+REQUEST_METRICS = env.bool("REQUEST_METRICS", default=False)
+# If set, /metrics requires "Authorization: Bearer <token>"
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+
+# Gzip responses of at least COMPRESSION_MIN_SIZE bytes (apps.common.middleware.CompressionMiddleware);
+# disable when a proxy in front already compresses
+RESPONSE_COMPRESSION = env.bool("RESPONSE_COMPRESSION", default=True)
+COMPRESSION_MIN_SIZE = env.int("COMPRESSION_MIN_SIZE", default=1024)
+# Lifetime of gzipped payloads cached under their ETag (apps.common.conditional); a new ETag misses anyway
+PAYLOAD_CACHE_TTL = env.int("PAYLOAD_CACHE_TTL", default=3600)
+
+# Lifetime of a user's cached group names and extra permissions (apps.common.rbac); changes delete them
+RBAC_GRANTS_TTL = env.int("RBAC_GRANTS_TTL", default=300)
+
+# Daily sales rollups (apps.reports.rollups): rows updated up to ROLLUP_WATERMARK_OVERLAP seconds before the
+# last refresh are re-read, so keep it above the longest write transaction; the last ROLLUP_RECENT_DAYS service
+# days are recomputed on every refresh to pick up deletes, moved menus and recategorized items
+ROLLUP_WATERMARK_OVERLAP = env.int("ROLLUP_WATERMARK_OVERLAP", default=600)
+ROLLUP_RECENT_DAYS = env.int("ROLLUP_RECENT_DAYS", default=2)
+
+# Redis (apps.common.redis_client)
 REDIS_HOST = env("REDIS_HOST", default="localhost")
 REDIS_PORT = env("REDIS_PORT", default=6379, cast=int)
+REDIS_PASSWORD = env("REDIS_PASSWORD", default="")
+# Database number per logical client; sessions and the mail queue stay in 0, where they always lived
+REDIS_DATABASES = {
+    "sessions": env.int("REDIS_SESSIONS_DB", default=0),
+    "queue": env.int("REDIS_QUEUE_DB", default=0),
+    "cache": env.int("REDIS_CACHE_DB", default=1),
+    "ratelimit": env.int("REDIS_RATELIMIT_DB", default=2),
+}
+# Per process and logical client; requests wait up to REDIS_POOL_TIMEOUT seconds for a free connection
+REDIS_MAX_CONNECTIONS = env.int("REDIS_MAX_CONNECTIONS", default=20)
+REDIS_POOL_TIMEOUT = env.float("REDIS_POOL_TIMEOUT", default=2.0)
+REDIS_CONNECT_TIMEOUT = env.float("REDIS_CONNECT_TIMEOUT", default=2.0)
+REDIS_SOCKET_TIMEOUT = env.float("REDIS_SOCKET_TIMEOUT", default=5.0)
+REDIS_HEALTH_CHECK_INTERVAL = env.int("REDIS_HEALTH_CHECK_INTERVAL", default=30)
+# "host:port" entries; when set, clients connect to the master of REDIS_SENTINEL_MASTER
+REDIS_SENTINELS = env.list("REDIS_SENTINELS", default=[])
+REDIS_SENTINEL_MASTER = env("REDIS_SENTINEL_MASTER", default="mymaster")
 
 # MFA
 MFA_FERNET_KEY = env("MFA_FERNET_KEY", default="")
+# Comma-separated, newest first. The first key encrypts; all keys decrypt (see `manage.py rotate_mfa_keys`)
+MFA_FERNET_KEYS = env.list("MFA_FERNET_KEYS", default=[])
 
 # Microsoft OAuth Settings
 MICROSOFT_CLIENT_ID = env("MICROSOFT_CLIENT_ID", default="")
 MICROSOFT_CLIENT_SECRET = env("MICROSOFT_CLIENT_SECRET", default="")
 MICROSOFT_TENANT_ID = env("MICROSOFT_TENANT_ID", default="common")
 MICROSOFT_REDIRECT_URI = env("MICROSOFT_REDIRECT_URI", default="http://localhost:8000/auth/microsoft/callback")
+# Override to point at a local stub authority (disable instance discovery for non-Microsoft hosts)
+MICROSOFT_AUTHORITY = env("MICROSOFT_AUTHORITY", default=f"https://login.microsoftonline.com/{MICROSOFT_TENANT_ID}")
+MICROSOFT_INSTANCE_DISCOVERY = env.bool("MICROSOFT_INSTANCE_DISCOVERY", default=True)
+MICROSOFT_HTTP_TIMEOUT = env.float("MICROSOFT_HTTP_TIMEOUT", default=10.0)
 
 # Frontend URL for redirects after OAuth
 FRONTEND_URL = env("FRONTEND_URL", default="http://localhost:8080")
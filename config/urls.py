@@ -6,6 +6,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from apps.common.views import health_view, metrics_view
+
 swagger_urls = [
     path("schema/swagger-ui/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -18,11 +20,14 @@ api_urls = [
     path("wallets/", include("apps.wallets.urls", namespace="wallets")),
     path("webhooks/", include("apps.webhooks.urls", namespace="webhooks")),
     path("orders/", include("apps.orders.urls", namespace="orders")),
+    path("reports/", include("apps.reports.urls", namespace="reports")),
     path("", include("apps.menus.urls", namespace="menus")),
     path("", include(swagger_urls)),
 ]
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("health", health_view, name="health"),
+    path("metrics", metrics_view, name="metrics"),
     path("", include(api_urls)),
 ]
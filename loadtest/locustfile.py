@@ -0,0 +1,181 @@
+"""
+Load test for the ordering flow: register -> login -> GET /menus -> POST /orders/ -> capture -> refund.
+
+Setup (locust is not a project dependency):
+
+    pip install locust
+    python manage.py generate_data --users 2000 --weeks 4
+    QUERY_COUNT_HEADER=True RATELIMIT_ENABLED=False python manage.py runserver
+    locust -f loadtest/locustfile.py --host http://localhost:8000 -u 200 -r 20 -t 5m --headless
+
+LOADTEST_USERS, LOADTEST_DOMAIN and LOADTEST_PASSWORD must match the generate_data arguments.
+At the end a per-endpoint table with p50/p99 latency and SQL queries per request (from the
+X-DB-Query-Count header) is printed, and written as JSON to LOADTEST_REPORT if set.
+"""
+
+import json
+import os
+import random
+import uuid
+from collections import defaultdict, deque
+
+from locust import HttpUser, between, events, task
+
+USERS = int(os.environ.get("LOADTEST_USERS", "1000"))
+DOMAIN = os.environ.get("LOADTEST_DOMAIN", "loadtest.utm.md")
+PASSWORD = os.environ.get("LOADTEST_PASSWORD", "LoadTest-2025!")
+REPORT_PATH = os.environ.get("LOADTEST_REPORT")
+
+# Orders placed by customers, waiting for staff to capture / captured and refundable
+pending_orders = deque(maxlen=10_000)
+captured_orders = deque(maxlen=10_000)
+
+query_counts = defaultdict(list)
+
+
+@events.request.add_listener
+def _record_queries(name, response, exception, **kwargs):
+    if exception is None and response is not None and "X-DB-Query-Count" in response.headers:
+        query_counts[name].append(int(response.headers["X-DB-Query-Count"]))
+
+
+@events.quitting.add_listener
+def _report(environment, **kwargs):
+    rows = []
+    for entry in sorted(environment.stats.entries.values(), key=lambda entry: entry.name):
+        queries = sorted(query_counts.get(entry.name, []))
+        rows.append(
+            {
+                "endpoint": f"{entry.method} {entry.name}",
+                "requests": entry.num_requests,
+                "failures": entry.num_failures,
+                "p50_ms": entry.get_response_time_percentile(0.5),
+                "p99_ms": entry.get_response_time_percentile(0.99),
+                "queries_avg": round(sum(queries) / len(queries), 1) if queries else None,
+                "queries_max": queries[-1] if queries else None,
+            }
+        )
+
+    print(f"\n{'endpoint':<40} {'reqs':>7} {'fail':>5} {'p50 ms':>8} {'p99 ms':>8} {'q avg':>7} {'q max':>6}")
+    for row in rows:
+        print(
+            f"{row['endpoint']:<40} {row['requests']:>7} {row['failures']:>5} {row['p50_ms']:>8} {row['p99_ms']:>8} "
+            f"{row['queries_avg'] if row['queries_avg'] is not None else '-':>7} "
+            f"{row['queries_max'] if row['queries_max'] is not None else '-':>6}"
+        )
+
+    if REPORT_PATH:
+        with open(REPORT_PATH, "w") as report:  # noqa: PTH123
+            json.dump(rows, report, indent=2)
+
+
+class _ApiUser(HttpUser):
+    abstract = True
+    wait_time = between(1, 3)
+    email = None
+
+    def on_start(self):
+        with self.client.post(
+            "/auth/login/", json={"email": self.email, "password": PASSWORD}, catch_response=True
+        ) as response:
+            if response.status_code != 200 or "access" not in response.json():
+                response.failure(f"login failed ({response.status_code}), check LOADTEST_* settings")
+                self.stop()
+                return
+            self.client.headers["Authorization"] = f"Bearer {response.json()['access']}"
+
+
+class Customer(_ApiUser):
+    weight = 20
+
+    def on_start(self):
+        self.email = f"loadtest{random.randrange(USERS)}.user@{DOMAIN}"
+        super().on_start()
+        self.menus = []
+
+    @task(5)
+    def browse_menus(self):
+        response = self.client.get("/menus?week_offset=1", name="/menus")
+        if response.ok:
+            self.menus = [menu for menu in response.json()["results"] if menu["menu_items"]]
+        self.client.get("/menus", name="/menus")
+
+    @task(3)
+    def place_order(self):
+        if not self.menus:
+            self.browse_menus()
+            if not self.menus:
+                return
+
+        menu = random.choice(self.menus)
+        items = random.sample(menu["menu_items"], k=min(len(menu["menu_items"]), random.randint(1, 3)))
+        with self.client.post(
+            "/orders/",
+            json={
+                "menu": menu["id"],
+                "reservation_time": menu["start_time"],
+                "items": [{"menu_item_id": item["id"], "quantity": 1} for item in items],
+            },
+            catch_response=True,
+        ) as response:
+            if response.status_code == 201:
+                pending_orders.append(response.json()["id"])
+            elif response.status_code == 400:
+                # Sold out / insufficient funds are valid business outcomes under load
+                response.success()
+
+    @task(2)
+    def my_orders(self):
+        self.client.get("/orders/")
+
+    @task(2)
+    def wallet(self):
+        self.client.get("/wallets/me/")
+        self.client.get("/wallets/me/transactions/")
+
+
+class Staff(_ApiUser):
+    weight = 2
+    wait_time = between(0.5, 1.5)
+
+    def on_start(self):
+        self.email = f"loadtest.staff@{DOMAIN}"
+        super().on_start()
+
+    @task(5)
+    def capture(self):
+        if not pending_orders:
+            return
+        order_id = pending_orders.popleft()
+        response = self.client.post("/orders/capture/", json={"order_id": order_id})
+        if response.status_code == 201:
+            captured_orders.append(order_id)
+
+    @task(1)
+    def refund(self):
+        if captured_orders:
+            self.client.post("/orders/refund/", json={"order_id": captured_orders.popleft()})
+
+    @task(2)
+    def all_orders(self):
+        self.client.get("/orders/?count=false", name="/orders/ (staff)")
+
+
+class Registration(HttpUser):
+    """New accounts: register and log in (unverified, so they can only browse)."""
+
+    weight = 1
+    wait_time = between(5, 10)
+
+    @task
+    def register_and_login(self):
+        email = f"signup.{uuid.uuid4().hex[:12]}@{DOMAIN}"
+        response = self.client.post(
+            "/auth/register/", json={"email": email, "password": PASSWORD, "password2": PASSWORD}
+        )
+        if response.status_code != 201:
+            return
+        self.client.post("/auth/login/", json={"email": email, "password": PASSWORD})
+        self.client.get(
+            "/menus", name="/menus", headers={"Authorization": f"Bearer {response.json().get('access', '')}"}
+        )
@@ -0,0 +1,61 @@
+"""
+Closed-loop throughput check for one endpoint, without extra dependencies:
+
+    python loadtest/throughput.py http://localhost:8000/menus --concurrency 16 --duration 30 --token <access JWT>
+
+Used to compare serving modes (runserver vs gunicorn); see config/gunicorn_conf.py.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("url")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--token", help="Bearer token for authenticated endpoints")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    deadline = time.perf_counter() + args.duration
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(urllib.request.Request(args.url, headers=headers), timeout=30) as response:
+                    response.read()
+                ok = True
+            except (urllib.error.URLError, OSError):
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                (latencies if ok else errors).append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    if not latencies:
+        raise SystemExit(f"All {len(errors)} requests failed")
+    p50 = latencies[len(latencies) // 2] * 1e3
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e3
+    print(
+        f"{len(latencies) / args.duration:.1f} req/s  p50 {p50:.1f} ms  p99 {p99:.1f} ms  "
+        f"mean {statistics.fmean(latencies) * 1e3:.1f} ms  errors {len(errors)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
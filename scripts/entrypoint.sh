@@ -4,7 +4,10 @@ if [ "${DATABASE:-}" = "postgres" ]; then
   /app/scripts/wait_db.sh
 fi
 
-# if DB is ready then run migrations
-/app/.venv/bin/python manage.py migrate --noinput
+# Migrations run once per deploy (`migrate` service in compose.yaml), not in every web/worker container.
+# Set MIGRATE_ON_START=1 to run them here, e.g. for a single-container setup.
+if [ "${MIGRATE_ON_START:-0}" = "1" ]; then
+  /app/.venv/bin/python manage.py migrate --noinput
+fi
 
-exec "$@"
\ No newline at end of file
+exec "$@"